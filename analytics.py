@@ -0,0 +1,227 @@
+from collections import Counter
+from datetime import date
+
+from entry_record import date_ordinal
+from optional_deps import require_numpy
+
+np = None
+
+# Symptom analytics over the entry store.
+#
+# Adding or removing an entry only touches a handful of running totals
+# (per-symptom counts, per-day and per-weekday severity sums, per-trigger
+# sums), so keeping them current costs O(changed entries). results() turns
+# those totals into NumPy arrays -- rolling daily/weekly severity, a
+# symptom x weekday heatmap and trigger/severity correlations -- in time
+# proportional to the number of distinct days, symptoms and triggers, and
+# caches the answer until the next change. NumPy is imported on first use.
+
+ROLLING_DAYS = 7
+HEATMAP_SYMPTOMS = 10
+# Triggers seen fewer times than this are too noisy to correlate.
+MIN_TRIGGER_COUNT = 3
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        np = require_numpy("analytics")
+
+
+def severity_value(entry):
+    try:
+        return int(entry.get("severity", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def split_triggers(value):
+    triggers = {part.strip().lower() for part in (value or "").split(",")}
+    triggers.discard("")
+    return triggers
+
+
+class SymptomAnalytics:
+    def __init__(self, entries=()):
+        self.counts = Counter()
+        self._days = {}
+        self._weekdays = {}
+        self._triggers = {}
+        self._n = 0
+        self._sum = 0
+        self._sumsq = 0
+        self._cache = None
+        for entry in entries:
+            self._apply(entry, 1)
+
+    def add(self, entry):
+        self._apply(entry, 1)
+        self._cache = None
+
+    def add_many(self, entries):
+        for entry in entries:
+            self._apply(entry, 1)
+        self._cache = None
+
+    def remove_many(self, entries):
+        for entry in entries:
+            self._apply(entry, -1)
+        self._cache = None
+
+    def _apply(self, entry, sign):
+        symptom = entry.get("symptom", "")
+        self.counts[symptom] += sign
+        if self.counts[symptom] <= 0:
+            del self.counts[symptom]
+
+        severity = severity_value(entry)
+        scored = severity is not None
+        ordinal = date_ordinal(entry.get("date"))
+        if ordinal:
+            # Per day: [severity sum, scored entries, all entries].
+            day = self._days.setdefault(ordinal, [0, 0, 0])
+            day[2] += sign
+            # Per symptom: counts, severity sums and scored counts by weekday (Mon=0).
+            weekday = (ordinal - 1) % 7
+            cells = self._weekdays.setdefault(symptom, ([0] * 7, [0] * 7, [0] * 7))
+            cells[0][weekday] += sign
+            if scored:
+                day[0] += sign * severity
+                day[1] += sign
+                cells[1][weekday] += sign * severity
+                cells[2][weekday] += sign
+            if not day[2]:
+                del self._days[ordinal]
+
+        if scored:
+            self._n += sign
+            self._sum += sign * severity
+            self._sumsq += sign * severity * severity
+            for trigger in split_triggers(entry.get("triggers")):
+                totals = self._triggers.setdefault(trigger, [0, 0])
+                totals[0] += sign
+                totals[1] += sign * severity
+                if not totals[0]:
+                    del self._triggers[trigger]
+
+    def results(self):
+        if self._cache is None:
+            _require_numpy()
+            self._cache = {
+                "symptom_counts": self.counts.most_common(),
+                "daily": self._daily(),
+                "weekly": self._weekly(),
+                "heatmap": self._heatmap(),
+                "triggers": self._trigger_correlation(),
+            }
+        return self._cache
+
+    def _day_arrays(self):
+        ordinals = np.fromiter(sorted(self._days), dtype=np.int64, count=len(self._days))
+        totals = np.array([self._days[ordinal][:2] for ordinal in ordinals.tolist()], dtype=float).reshape(-1, 2)
+        return ordinals, totals[:, 0], totals[:, 1]
+
+    def _daily(self):
+        ordinals, sums, scored = self._day_arrays()
+        if not len(ordinals):
+            return {"dates": [], "mean": np.array([]), "rolling": np.array([])}
+        # Spread onto a contiguous calendar so the rolling window counts days, not entries.
+        span = ordinals[-1] - ordinals[0] + 1
+        day_sums = np.zeros(span)
+        day_scored = np.zeros(span)
+        day_sums[ordinals - ordinals[0]] = sums
+        day_scored[ordinals - ordinals[0]] = scored
+        window = np.ones(ROLLING_DAYS)
+        rolling_sums = np.convolve(day_sums, window)[:span]
+        rolling_scored = np.convolve(day_scored, window)[:span]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = day_sums / day_scored
+            rolling = rolling_sums / rolling_scored
+        first = date.fromordinal(int(ordinals[0]))
+        dates = np.arange(np.datetime64(first), np.datetime64(first) + span)
+        return {"dates": dates, "mean": mean, "rolling": rolling}
+
+    def _weekly(self):
+        ordinals, sums, scored = self._day_arrays()
+        if not len(ordinals):
+            return {"weeks": [], "mean": np.array([])}
+        # Week buckets start on Monday.
+        week_starts = ordinals - (ordinals - 1) % 7
+        weeks, bucket = np.unique(week_starts, return_inverse=True)
+        week_sums = np.bincount(bucket, weights=sums)
+        week_scored = np.bincount(bucket, weights=scored)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = week_sums / week_scored
+        labels = [date.fromordinal(int(ordinal)) for ordinal in weeks]
+        return {"weeks": np.array(labels, dtype="datetime64[D]"), "mean": mean}
+
+    def _heatmap(self):
+        symptoms = [symptom for symptom, _count in self.counts.most_common(HEATMAP_SYMPTOMS) if symptom in self._weekdays]
+        cells = np.array([self._weekdays[symptom] for symptom in symptoms], dtype=float).reshape(-1, 3, 7)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            severity = cells[:, 1] / cells[:, 2]
+        return {"symptoms": symptoms, "weekdays": WEEKDAYS, "counts": cells[:, 0], "severity": severity}
+
+    def _trigger_correlation(self):
+        # Point-biserial correlation between "entry lists this trigger" and severity,
+        # computed from running sums only.
+        names = sorted(name for name, totals in self._triggers.items() if totals[0] >= MIN_TRIGGER_COUNT)
+        n = self._n
+        if not names or n < 2:
+            return {"triggers": [], "count": np.array([]), "mean_severity": np.array([]), "correlation": np.array([])}
+        totals = np.array([self._triggers[name] for name in names], dtype=float)
+        with_count, with_sum = totals[:, 0], totals[:, 1]
+        without_count = n - with_count
+        mean_all = self._sum / n
+        std_all = np.sqrt(max(self._sumsq / n - mean_all * mean_all, 0.0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_with = with_sum / with_count
+            mean_without = (self._sum - with_sum) / without_count
+            correlation = (mean_with - mean_without) / std_all * np.sqrt(with_count * without_count) / n
+        correlation = np.where((without_count > 0) & (std_all > 0), correlation, np.nan)
+        order = np.argsort(-np.nan_to_num(correlation, nan=-np.inf))
+        return {
+            "triggers": [names[i] for i in order],
+            "count": with_count[order].astype(int),
+            "mean_severity": mean_with[order],
+            "correlation": correlation[order],
+        }
+
+
+def format_report(results, top=10):
+    lines = ["Symptoms"]
+    for symptom, count in results["symptom_counts"][:top]:
+        lines.append(f"- {symptom}: {count}")
+
+    daily = results["daily"]
+    if len(daily["dates"]):
+        latest = daily["rolling"][-1]
+        shown = "-" if np.isnan(latest) else f"{latest:.1f}"
+        lines.append("")
+        lines.append(f"{ROLLING_DAYS}-day average severity up to {daily['dates'][-1]}: {shown}")
+    weekly = results["weekly"]
+    if len(weekly["weeks"]):
+        lines.append("Recent weeks (average severity)")
+        for week, mean in list(zip(weekly["weeks"], weekly["mean"]))[-4:]:
+            lines.append(f"- week of {week}: {'-' if np.isnan(mean) else f'{mean:.1f}'}")
+
+    heatmap = results["heatmap"]
+    if heatmap["symptoms"]:
+        width = max(len(symptom) for symptom in heatmap["symptoms"])
+        lines.append("")
+        lines.append("Entries by weekday")
+        lines.append(" " * width + " " + " ".join(f"{day:>4}" for day in heatmap["weekdays"]))
+        for symptom, row in zip(heatmap["symptoms"], heatmap["counts"]):
+            lines.append(f"{symptom:<{width}} " + " ".join(f"{int(value):>4}" for value in row))
+
+    triggers = results["triggers"]
+    if triggers["triggers"]:
+        lines.append("")
+        lines.append("Triggers vs severity (correlation, entries, average severity)")
+        for name, corr, count, mean in list(
+            zip(triggers["triggers"], triggers["correlation"], triggers["count"], triggers["mean_severity"])
+        )[:top]:
+            shown = "-" if np.isnan(corr) else f"{corr:+.2f}"
+            lines.append(f"- {name}: {shown} ({count}, {mean:.1f})")
+    return "\n".join(lines)
@@ -0,0 +1,67 @@
+import queue
+import threading
+
+# Runs one long job (export, import, ...) on a worker thread.
+#
+# The job receives progress(fraction) and cancelled() callables. Progress and
+# the final result travel back through a queue that the Tk thread drains with
+# after(), so callbacks always run on the main thread.
+
+POLL_MS = 50
+
+
+class BackgroundTask:
+    def __init__(self, widget, work, on_progress=None, on_done=None, on_error=None):
+        self.widget = widget
+        self.work = work
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self._events = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.widget.after(POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            result = self.work(
+                progress=lambda fraction: self._events.put(("progress", fraction)),
+                cancelled=self._cancelled.is_set,
+            )
+        except Exception as exc:
+            self._events.put(("error", exc))
+        else:
+            self._events.put(("done", result))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                # Only the newest progress value matters; skip ahead if several queued up.
+                if self._events.empty() and self.on_progress:
+                    self.on_progress(value)
+                continue
+            callback = self.on_done if kind == "done" else self.on_error
+            if callback:
+                callback(value)
+            return
+        self.widget.after(POLL_MS, self._poll)
@@ -0,0 +1,259 @@
+import argparse
+import importlib.util
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from search_index import SearchIndex  # noqa: E402
+from synthetic import write_history  # noqa: E402
+from table_view import VirtualTable  # noqa: E402
+from tracker_core import DATA_FILE, Tracker, make_entry, parse_filter  # noqa: E402
+
+# Headless benchmarks for the tracker's hot paths.
+#
+# For each history size a synthetic data.json is generated once (and cached
+# in the work directory), then these are timed:
+#   load         Tracker.load()               (the app's _load_data)
+#   save         Tracker.save()               (full snapshot rewrite)
+#   add_entry    one Tracker.add_entry()      (_add_entry; returns once the write is queued)
+#   add_flush    add_entry() + Tracker.flush() (the same add, written to disk)
+#   index        SearchIndex() over all rows  (warm_index, after first paint)
+#   keystroke    Tracker.query() per prefix of a search word (_apply_filter)
+#   date_filter  Tracker.query() for a one-month From/To range
+#   refresh      VirtualTable.set_rows()      (_refresh_table)
+#   scroll_jump  VirtualTable.scroll_to()     (dragging the scrollbar to the middle)
+#   export_csv   Tracker.export_file(.csv)    (_export_csv)
+#   export_npz   Tracker.export_file(.npz)    (only if NumPy is installed)
+# Results go to a JSON file so runs from different versions can be compared
+# with --compare.
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+# --quick skips the million-entry history, which takes minutes to generate and time.
+QUICK_SIZES = [1_000, 100_000]
+SEARCH_WORD = "headache"
+COLUMNS = ("date", "symptom", "severity", "duration", "triggers")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class HeadlessTree:
+    # Just enough of ttk.Treeview for VirtualTable when no display is available.
+    def __init__(self):
+        self.items = {}
+
+    def configure(self, **options):
+        pass
+
+    def get_children(self):
+        return list(self.items)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.items.pop(iid, None)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.items[iid] = values
+        return iid
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def selection(self):
+        return ()
+
+    def selection_set(self, iids):
+        pass
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def after_idle(self, callback):
+        pass
+
+
+def make_tree():
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+
+        root = tk.Tk()
+        root.withdraw()
+        tree = ttk.Treeview(root, columns=COLUMNS, show="headings")
+        return tree, ttk.Scrollbar(root, command=tree.yview), root
+    except Exception:
+        return HeadlessTree(), None, None
+
+
+def timed(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(samples), "median_ms": statistics.median(samples), "max_ms": max(samples)}
+
+
+def history_dir(work_dir: Path, size: int, seed: int) -> Path:
+    source = work_dir / f"history-{size}-{seed}"
+    if not (source / DATA_FILE).exists():
+        source.mkdir(parents=True, exist_ok=True)
+        print(f"  generating {size} entries...", file=sys.stderr)
+        write_history(source / DATA_FILE, size, seed)
+    return source
+
+
+def bench_size(size: int, work_dir: Path, repeat: int, seed: int) -> Dict[str, Dict[str, float]]:
+    source = history_dir(work_dir, size, seed)
+    run_dir = work_dir / "run"
+    results = {}
+
+    shutil.rmtree(run_dir, ignore_errors=True)
+    run_dir.mkdir(parents=True)
+    shutil.copy(source / DATA_FILE, run_dir / DATA_FILE)
+    results["load"] = timed(lambda: load_and_close(run_dir), repeat)
+
+    tracker = Tracker(str(run_dir))
+    try:
+        tracker.load()
+        bench_tracker(tracker, work_dir, repeat, results)
+    finally:
+        tracker.close()
+    shutil.rmtree(run_dir, ignore_errors=True)
+    return results
+
+
+def load_and_close(run_dir: Path) -> None:
+    # Each timed load gets its own Tracker; closing it keeps writer threads and
+    # database connections from piling up under the later timings.
+    tracker = Tracker(str(run_dir))
+    try:
+        tracker.load()
+    finally:
+        tracker.close()
+
+
+def add_and_flush(tracker: Tracker, entry_date: str) -> None:
+    tracker.add_entry(make_entry(entry_date, "benchmark", "5"))
+    tracker.flush()
+
+
+def bench_tracker(tracker: Tracker, work_dir: Path, repeat: int, results: Dict[str, Dict[str, float]]) -> None:
+    results["save"] = timed(tracker.save, repeat)
+    entry_date = tracker.store.rows[-1].get("date")
+    results["add_entry"] = timed(lambda: tracker.add_entry(make_entry(entry_date, "benchmark", "5")), repeat)
+    tracker.flush()
+    results["add_flush"] = timed(lambda: add_and_flush(tracker, entry_date), repeat)
+
+    results["index"] = timed(lambda: SearchIndex(tracker.store.rows), repeat)
+    tracker.store.warm_index()
+
+    keystrokes = []
+    for _ in range(repeat):
+        for end in range(1, len(SEARCH_WORD) + 1):
+            start = time.perf_counter()
+            tracker.query(*parse_filter(SEARCH_WORD[:end], "", ""))
+            keystrokes.append((time.perf_counter() - start) * 1000)
+    results["keystroke"] = {
+        "min_ms": min(keystrokes),
+        "median_ms": statistics.median(keystrokes),
+        "max_ms": max(keystrokes),
+    }
+    month = entry_date[:8]
+    results["date_filter"] = timed(lambda: tracker.query(*parse_filter("", month + "01", month + "28")), repeat)
+
+    tree, scrollbar, root = make_tree()
+    table = VirtualTable(tree, scrollbar, COLUMNS)
+    rows = tracker.store.rows
+    results["refresh"] = timed(lambda: table.set_rows(rows), repeat)
+    results["scroll_jump"] = timed(lambda: table.scroll_to(len(rows) // 2), repeat)
+    if root is not None:
+        root.destroy()
+
+    export_dir = Path(tempfile.mkdtemp(dir=work_dir))
+    results["export_csv"] = timed(lambda: tracker.export_file(str(export_dir / "out.csv")), repeat)
+    if importlib.util.find_spec("numpy"):
+        results["export_npz"] = timed(lambda: tracker.export_file(str(export_dir / "out.npz")), repeat)
+    shutil.rmtree(export_dir, ignore_errors=True)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except Exception:
+        return None
+    return output.stdout.strip() or None
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    lines = [f"Compared with {baseline.get('label')} ({baseline.get('revision')})"]
+    for size, ops in current["sizes"].items():
+        old_ops = baseline.get("sizes", {}).get(size, {})
+        for op, stats in ops.items():
+            old = old_ops.get(op)
+            if not old:
+                continue
+            ratio = stats["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+            lines.append(f"- {size:>8} {op:<12} {old['median_ms']:10.2f} -> {stats['median_ms']:10.2f} ms  x{ratio:.2f}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the symptom tracker's hot paths")
+    parser.add_argument("--sizes", default=None,
+                        help="Comma-separated history sizes (default: " + ",".join(str(size) for size in DEFAULT_SIZES) + ")")
+    parser.add_argument("--quick", action="store_true",
+                        help="Default sizes without the largest: " + ",".join(str(size) for size in QUICK_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", default=None, help="Name of the results file (default: git revision)")
+    parser.add_argument("--work-dir", type=Path, default=Path(tempfile.gettempdir()) / "symptom-tracker-bench")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    label = args.label or revision or datetime.now().strftime("%Y%m%d-%H%M%S")
+    report = {
+        "label": label,
+        "revision": revision,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    if args.sizes:
+        sizes = [int(value) for value in args.sizes.split(",")]
+    else:
+        sizes = QUICK_SIZES if args.quick else DEFAULT_SIZES
+    for size in sizes:
+        print(f"{size} entries", file=sys.stderr)
+        report["sizes"][str(size)] = results = bench_size(size, args.work_dir, args.repeat, args.seed)
+        for op, stats in results.items():
+            print(f"- {op:<12} median {stats['median_ms']:10.2f} ms  (min {stats['min_ms']:.2f}, max {stats['max_ms']:.2f})")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path = RESULTS_DIR / f"{label}.json"
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nWrote {path}")
+
+    if args.compare:
+        with args.compare.open("r", encoding="utf-8") as handle:
+            print("\n".join(compare(report, json.load(handle))))
+
+
+if __name__ == "__main__":
+    main()
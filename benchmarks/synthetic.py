@@ -0,0 +1,97 @@
+import argparse
+import json
+import random
+import sys
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from entry_ids import new_id  # noqa: E402
+
+# Synthetic symptom histories for benchmarking.
+#
+# Symptom and trigger names follow a Zipf-like distribution (a few common
+# names, a long tail of rare ones), dates cover several years with several
+# entries on busy days, and a share of entries carry long free-text notes.
+# The same seed always produces the same history (apart from the ids).
+
+COMMON_SYMPTOMS = [
+    "headache", "fatigue", "nausea", "back pain", "migraine", "dizziness", "cough",
+    "joint pain", "insomnia", "anxiety", "heartburn", "sore throat", "rash", "fever",
+]
+TRIGGERS = [
+    "stress", "coffee", "poor sleep", "alcohol", "screen time", "weather", "exercise",
+    "dairy", "gluten", "skipped meal", "pollen", "travel", "dehydration", "noise",
+]
+DURATIONS = ["", "", "10 min", "30 min", "1 hour", "2 hours", "half a day", "all day"]
+WORDS = (
+    "woke up with a dull ache that got worse after lunch and eased in the evening "
+    "took ibuprofen rested in a dark room drank water felt better after a walk "
+    "noticed it again during the commute meeting ran long skipped breakfast"
+).split()
+ZIPF_EXPONENT = 1.1
+LONG_NOTE_SHARE = 0.15
+START_DATE = date(2021, 1, 1)
+
+
+def zipf_weights(count: int, exponent: float = ZIPF_EXPONENT) -> List[float]:
+    # Cumulative, so random.choices can bisect instead of re-summing per draw.
+    return list(accumulate(1.0 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def vocabulary(size: int, rng: random.Random) -> List[str]:
+    # The common names first, then a long tail of rarer variants.
+    names = list(COMMON_SYMPTOMS)
+    while len(names) < size:
+        names.append(f"{rng.choice(COMMON_SYMPTOMS)} variant {len(names)}")
+    return names[:size]
+
+
+def notes_text(rng: random.Random) -> str:
+    if rng.random() < LONG_NOTE_SHARE:
+        return " ".join(rng.choices(WORDS, k=rng.randint(60, 400)))
+    if rng.random() < 0.5:
+        return " ".join(rng.choices(WORDS, k=rng.randint(3, 15)))
+    return ""
+
+
+def generate(count: int, seed: int = 0, vocab_size: int = 200, years: int = 5) -> Iterator[Dict[str, str]]:
+    rng = random.Random(seed)
+    symptoms = vocabulary(vocab_size, rng)
+    symptom_weights = zipf_weights(len(symptoms))
+    trigger_weights = zipf_weights(len(TRIGGERS))
+    span = 365 * years
+    for _ in range(count):
+        triggers = set(rng.choices(TRIGGERS, cum_weights=trigger_weights, k=rng.randint(0, 3)))
+        yield {
+            "id": new_id(),
+            "date": (START_DATE + timedelta(days=int(rng.triangular(0, span, span)))).isoformat(),
+            "symptom": rng.choices(symptoms, cum_weights=symptom_weights)[0],
+            "severity": str(rng.randint(1, 10)),
+            "duration": rng.choice(DURATIONS),
+            "triggers": ", ".join(sorted(triggers)),
+            "notes": notes_text(rng),
+        }
+
+
+def write_history(path: Path, count: int, seed: int = 0) -> None:
+    # Same layout as data.json: a JSON list of entry objects.
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(list(generate(count, seed)), handle, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic symptom history")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_history(args.path, args.count, args.seed)
+    print(f"Wrote {args.count} entries to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import json
+import sys
+
+from analytics import SymptomAnalytics, format_report
+from csv_io import CSV_FIELDS
+from tracker_core import APP_DIR, Tracker, ValidationError, parse_filter
+
+# Command-line front end for the tracker core; needs no display.
+#
+#   python cli.py import history.csv
+#   python cli.py query --search headache --from 2026-01-01
+#   python cli.py export out.csv --to 2026-06-30
+#   python cli.py stats
+#   python cli.py trends --from 2026-01-01
+
+
+def add_filter_args(parser):
+    parser.add_argument("--search", default="", help="Text to find in symptom, triggers or notes")
+    parser.add_argument("--from", dest="from_date", default="", help="First date to include (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", default="", help="Last date to include (YYYY-MM-DD)")
+
+
+def run_query(tracker, args):
+    return tracker.query(*parse_filter(args.search, args.from_date, args.to_date))
+
+
+def print_progress(fraction):
+    print(f"\r{fraction * 100:5.1f}%", end="", file=sys.stderr, flush=True)
+
+
+def cmd_import(tracker, args):
+    imported, rejected = tracker.import_file(args.path, progress=print_progress)
+    print(file=sys.stderr)
+    print(f"Imported {imported} entries ({len(tracker.store)} total)")
+    if rejected:
+        print(f"Skipped {rejected} rows with a missing symptom or invalid date", file=sys.stderr)
+
+
+def cmd_query(tracker, args):
+    results = run_query(tracker, args)
+    if args.json:
+        json.dump([dict(entry) for entry in results], sys.stdout, indent=2)
+        print()
+        return
+    for entry in results:
+        print("\t".join(entry.get(field, "") for field in CSV_FIELDS[:-1]))
+    print(f"{len(results)} of {len(tracker.store)} entries", file=sys.stderr)
+
+
+def cmd_export(tracker, args):
+    results = run_query(tracker, args)
+    tracker.export_file(args.path, results, progress=print_progress)
+    print(file=sys.stderr)
+    print(f"Exported {len(results)} entries to {args.path}")
+
+
+def cmd_stats(tracker, args):
+    stats = tracker.stats(run_query(tracker, args))
+    if args.json:
+        json.dump(stats, sys.stdout, indent=2)
+        print()
+        return
+    print(f"Entries: {stats['entries']}")
+    if stats["entries"]:
+        print(f"Dates: {stats['first_date']} to {stats['last_date']}")
+    for row in stats["symptoms"][: args.top]:
+        avg = "-" if row["avg_severity"] is None else f"{row['avg_severity']:.1f}"
+        print(f"- {row['symptom']}: {row['count']} (avg severity {avg})")
+
+
+def cmd_trends(tracker, args):
+    if args.search or args.from_date or args.to_date:
+        analytics = SymptomAnalytics(run_query(tracker, args))
+    else:
+        analytics = tracker.analytics
+    try:
+        results = analytics.results()
+    except RuntimeError as exc:
+        raise ValidationError("Trends", str(exc))
+    print(format_report(results, args.top))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Symptom Tracker command line")
+    parser.add_argument("--data-dir", default=APP_DIR, help="Folder holding data.json / symptoms.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Bulk import entries from CSV, JSON or columnar .npz")
+    importer.add_argument("path")
+    importer.set_defaults(func=cmd_import)
+
+    query = commands.add_parser("query", help="List entries matching a filter")
+    add_filter_args(query)
+    query.add_argument("--json", action="store_true", help="Print full entries as JSON")
+    query.set_defaults(func=cmd_query)
+
+    export = commands.add_parser("export", help="Export entries matching a filter to CSV or columnar .npz")
+    export.add_argument("path")
+    add_filter_args(export)
+    export.set_defaults(func=cmd_export)
+
+    stats = commands.add_parser("stats", help="Summarize entries per symptom")
+    add_filter_args(stats)
+    stats.add_argument("--top", type=int, default=10, help="How many symptoms to list")
+    stats.add_argument("--json", action="store_true", help="Print stats as JSON")
+    stats.set_defaults(func=cmd_stats)
+
+    trends = commands.add_parser("trends", help="Severity trends, weekday heatmap and trigger correlation (needs NumPy)")
+    add_filter_args(trends)
+    trends.add_argument("--top", type=int, default=10, help="How many symptoms and triggers to list")
+    trends.set_defaults(func=cmd_trends)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    tracker = Tracker(args.data_dir)
+    try:
+        tracker.load()
+        args.func(tracker, args)
+    except ValidationError as exc:
+        print(f"{exc.title}: {exc.message}", file=sys.stderr)
+        return 2
+    finally:
+        tracker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+from datetime import date
+
+from entry_record import FIELDS, Entry, date_ordinal
+from optional_deps import require_numpy
+
+np = None
+
+# Columnar .npz export of entry history.
+#
+# Each field is stored as a typed NumPy array so analysis tools can
+# np.load() years of history without re-parsing text:
+#   date       datetime64[D] (NaT where the entry's date is unreadable)
+#   severity   int8, 0 where the severity is missing or not a whole number
+#   symptom    int32 codes into symptom_vocab (dictionary-encoded)
+#   duration   int32 codes into duration_vocab
+#   triggers   int32 codes into triggers_vocab
+#   id, notes  UTF-8 bytes in *_data with int64 *_offsets (Arrow-style)
+# read_npz() turns the columns straight back into entries for a bulk load.
+# NumPy is optional and only imported the first time a .npz file is touched.
+
+FORMAT_VERSION = 1
+DICTIONARY_FIELDS = ("symptom", "duration", "triggers")
+TEXT_FIELDS = ("id", "notes")
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        np = require_numpy(".npz files")
+
+
+def _pack_strings(values):
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _unpack_strings(offsets, data):
+    blob = data.tobytes()
+    bounds = offsets.tolist()
+    return [blob[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+
+
+def _dictionary_encode(values):
+    vocab = {}
+    codes = np.fromiter((vocab.setdefault(value, len(vocab)) for value in values), dtype=np.int32, count=len(values))
+    return codes, np.array(list(vocab), dtype=str)
+
+
+def _severity(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return number if 0 < number < 128 else 0
+
+
+def write_npz(path, entries):
+    _require_numpy()
+    entries = list(entries)
+    count = len(entries)
+
+    ordinals = np.fromiter((date_ordinal(entry.get("date")) for entry in entries), dtype=np.int64, count=count)
+    days = np.where(ordinals > 0, ordinals - EPOCH_ORDINAL, np.iinfo(np.int64).min)
+    columns = {
+        "format_version": np.array(FORMAT_VERSION),
+        "date": days.view("datetime64[D]"),
+        "severity": np.fromiter((_severity(entry.get("severity")) for entry in entries), dtype=np.int8, count=count),
+    }
+    for field in DICTIONARY_FIELDS:
+        codes, vocab = _dictionary_encode([entry.get(field, "") for entry in entries])
+        columns[field] = codes
+        columns[f"{field}_vocab"] = vocab
+    for field in TEXT_FIELDS:
+        offsets, data = _pack_strings([entry.get(field, "") for entry in entries])
+        columns[f"{field}_offsets"] = offsets
+        columns[f"{field}_data"] = data
+
+    with open(path, "wb") as handle:
+        np.savez_compressed(handle, **columns)
+    return count
+
+
+def read_npz(path):
+    _require_numpy()
+    with np.load(path, allow_pickle=False) as archive:
+        version = int(archive["format_version"])
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version {version}.")
+        dates = archive["date"].astype(str)
+        dates[dates == "NaT"] = ""
+        severity = archive["severity"].astype(str)
+        severity[severity == "0"] = ""
+        columns = {"date": dates.tolist(), "severity": severity.tolist()}
+        for field in DICTIONARY_FIELDS:
+            columns[field] = archive[f"{field}_vocab"][archive[field]].tolist()
+        for field in TEXT_FIELDS:
+            columns[field] = _unpack_strings(archive[f"{field}_offsets"], archive[f"{field}_data"])
+
+    return [Entry(*row) for row in zip(*(columns[field] for field in FIELDS))]
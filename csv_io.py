@@ -0,0 +1,55 @@
+import csv
+import io
+import os
+
+# Streaming CSV reader/writer for entry history.
+#
+# Both directions work in fixed-size chunks so memory stays bounded no matter
+# how long the file is, and both report progress as a 0..1 fraction and stop
+# early when the caller's cancelled() returns True. They never touch Tk, so
+# they can run on a background thread.
+
+CSV_FIELDS = ["date", "symptom", "severity", "duration", "triggers", "notes"]
+EXPORT_CHUNK = 5000
+IMPORT_BATCH = 5000
+
+
+class TransferCancelled(Exception):
+    pass
+
+
+def write_csv_chunks(path, entries, chunk_size=EXPORT_CHUNK, progress=None, cancelled=None):
+    total = len(entries)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for start in range(0, total, chunk_size):
+            if cancelled and cancelled():
+                raise TransferCancelled()
+            writer.writerows(entries[start:start + chunk_size])
+            if progress:
+                progress(min(start + chunk_size, total) / total)
+    return total
+
+
+def read_csv_batches(path, batch_size=IMPORT_BATCH, progress=None, cancelled=None):
+    size = os.path.getsize(path) or 1
+    with open(path, "rb") as raw:
+        # Progress comes from the byte offset of the underlying file, which stays
+        # readable while the csv module iterates the text layer.
+        handle = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(handle)
+        batch = []
+        for row in reader:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                if cancelled and cancelled():
+                    raise TransferCancelled()
+                yield batch
+                batch = []
+                if progress:
+                    progress(min(raw.tell() / size, 1.0))
+        if batch:
+            yield batch
+    if progress:
+        progress(1.0)
@@ -0,0 +1,91 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+# Debug window for the timing spans in perf_trace.
+#
+# Opening it turns span recording on; closing it turns recording back off
+# unless it was already on (e.g. from SYMPTOM_TRACKER_TRACE). The table shows
+# per-span count and last/mean/max time, refreshed every REFRESH_MS. Trace
+# events and a cProfile run can be started here and saved to a file.
+
+REFRESH_MS = 500
+COLUMNS = ("span", "count", "last", "mean", "max")
+
+
+class DebugPanel:
+    def __init__(self, root, recorder):
+        self.root = root
+        self.recorder = recorder
+        self._was_enabled = recorder.enabled
+        self._refresh_id = None
+        recorder.enabled = True
+
+        window = tk.Toplevel(root)
+        window.title("Performance")
+        window.protocol("WM_DELETE_WINDOW", self.close)
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+        self.window = window
+
+        table = ttk.Treeview(window, columns=COLUMNS, show="headings", height=10)
+        for column in COLUMNS:
+            table.heading(column, text=column.title() if column in ("span", "count") else f"{column.title()} (ms)")
+            table.column(column, width=160 if column == "span" else 80, anchor="w" if column == "span" else "e")
+        table.grid(row=0, column=0, sticky="nsew", padx=12, pady=(12, 6))
+        self.table = table
+
+        buttons = ttk.Frame(window)
+        buttons.grid(row=1, column=0, sticky="ew", padx=12, pady=(0, 12))
+        self.trace_var = tk.BooleanVar(value=recorder.tracing)
+        ttk.Checkbutton(buttons, text="Record trace", variable=self.trace_var, command=self._toggle_trace).grid(
+            row=0, column=0, padx=(0, 6)
+        )
+        ttk.Button(buttons, text="Save Trace...", command=self._save_trace).grid(row=0, column=1, padx=(0, 6))
+        self.profile_button = ttk.Button(buttons, command=self._toggle_profile)
+        self.profile_button.grid(row=0, column=2, padx=(0, 6))
+        ttk.Button(buttons, text="Reset", command=self._reset).grid(row=0, column=3)
+        self._refresh()
+
+    def _refresh(self):
+        self.table.delete(*self.table.get_children())
+        for name, count, last_ms, mean_ms, max_ms in self.recorder.snapshot():
+            self.table.insert("", "end", values=(name, count, f"{last_ms:.1f}", f"{mean_ms:.1f}", f"{max_ms:.1f}"))
+        self.profile_button.configure(text="Stop Profiling..." if self.recorder.profiling else "Start Profiling")
+        self._refresh_id = self.window.after(REFRESH_MS, self._refresh)
+
+    def _toggle_trace(self):
+        self.recorder.tracing = self.trace_var.get()
+
+    def _save_trace(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Save Trace",
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json")],
+        )
+        if path:
+            count = self.recorder.dump_trace(path)
+            messagebox.showinfo("Trace Saved", f"Wrote {count} span events.", parent=self.window)
+
+    def _toggle_profile(self):
+        if not self.recorder.profiling:
+            self.recorder.start_profile()
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Save Profile",
+            defaultextension=".prof",
+            filetypes=[("cProfile stats", "*.prof")],
+        )
+        if path:
+            self.recorder.stop_profile(path)
+
+    def _reset(self):
+        self.recorder.reset()
+
+    def close(self):
+        if self._refresh_id is not None:
+            self.window.after_cancel(self._refresh_id)
+            self._refresh_id = None
+        self.recorder.enabled = self._was_enabled
+        self.window.destroy()
@@ -0,0 +1,76 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Collision-free ids for entries and reminders.
+#
+# Ids keep the old UTC ISO timestamp look but carry microseconds, and every
+# new id is at least one microsecond past the previous one, so ids are unique
+# and increasing even when many are minted within the same clock tick or the
+# clock steps backwards. advance_past() moves the counter beyond ids already
+# on disk, which keeps ids monotonic across restarts too.
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def id_micros(value):
+    # Microseconds since the epoch encoded in an id, or None if it isn't a timestamp.
+    try:
+        return (datetime.fromisoformat(value) - EPOCH) // ONE_MICROSECOND
+    except (TypeError, ValueError):
+        return None
+
+
+class MonotonicIds:
+    def __init__(self):
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            self._last = max(time.time_ns() // 1000, self._last + 1)
+            value = self._last
+        return (EPOCH + timedelta(microseconds=value)).isoformat(timespec="microseconds")
+
+    def advance_past(self, ids):
+        # Old second-resolution ids compare below their microsecond successors,
+        # so the string maximum is also the latest timestamp. Missing or
+        # non-string ids are skipped; if the maximum is not a timestamp (a
+        # hand-edited id), every id that parses is considered instead.
+        ids = [value for value in ids if isinstance(value, str) and value]
+        latest = id_micros(max(ids, default=None))
+        if latest is None:
+            latest = max((micros for micros in map(id_micros, ids) if micros is not None), default=None)
+        if latest is not None:
+            with self._lock:
+                self._last = max(self._last, latest)
+
+
+_ids = MonotonicIds()
+
+
+def new_id():
+    return _ids.next()
+
+
+def advance_past(ids):
+    _ids.advance_past(ids)
+
+
+def assign_unique_ids(items, taken=(), get_id=None, set_id=None):
+    # Gives each item whose id is repeated (or already in taken) a fresh id.
+    # Returns how many items were re-keyed.
+    get_id = get_id or (lambda item: item.id)
+    set_id = set_id or (lambda item, value: setattr(item, "id", value))
+    seen = set()
+    rekeyed = 0
+    for item in items:
+        item_id = get_id(item)
+        if not item_id or item_id in seen or item_id in taken:
+            while not item_id or item_id in seen or item_id in taken:
+                item_id = new_id()
+            set_id(item, item_id)
+            rekeyed += 1
+        seen.add(item_id)
+    return rekeyed
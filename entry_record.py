@@ -0,0 +1,88 @@
+import sys
+from datetime import date, datetime
+
+# Compact in-memory symptom entry.
+#
+# A dict per entry costs several hundred bytes before counting its seven
+# strings. Entry keeps the same fields in __slots__ instead, with the date as
+# an integer ordinal, the severity as a small int, and symptom, duration and
+# trigger strings interned so repeated names share one object. Entries still
+# read like the old dicts -- get(), ["field"] and dict(entry) return the same
+# strings -- so JSON, CSV and SQLite code converts them only at the boundary.
+# A date or severity that doesn't round-trip through its compact form is kept
+# as the original text.
+
+DATE_FMT = "%Y-%m-%d"
+TIME_FMT = "%H:%M"
+FIELDS = ("id", "date", "symptom", "severity", "duration", "triggers", "notes")
+
+
+def date_ordinal(value):
+    value = (value or "").strip()
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, DATE_FMT).date().toordinal()
+    except ValueError:
+        return 0
+
+
+def _text(value):
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+class Entry:
+    __slots__ = ("id", "ordinal", "symptom", "severity", "duration", "triggers", "notes", "_date")
+
+    def __init__(self, entry_id, date_value, symptom="", severity="", duration="", triggers="", notes=""):
+        self.id = _text(entry_id)
+        date_value = _text(date_value)
+        self.ordinal = date_ordinal(date_value)
+        canonical = self.ordinal and date.fromordinal(self.ordinal).isoformat() == date_value
+        self._date = None if canonical else date_value
+        if isinstance(severity, int) or (isinstance(severity, str) and severity.isdecimal() and str(int(severity)) == severity):
+            self.severity = int(severity)
+        else:
+            self.severity = _text(severity)
+        self.symptom = sys.intern(_text(symptom))
+        self.duration = sys.intern(_text(duration))
+        self.triggers = sys.intern(_text(triggers))
+        self.notes = _text(notes)
+
+    @classmethod
+    def from_dict(cls, row):
+        return cls(*(row.get(field) for field in FIELDS))
+
+    @property
+    def date(self):
+        if self._date is None:
+            return date.fromordinal(self.ordinal).isoformat()
+        return self._date
+
+    def get(self, field, default=None):
+        if field == "date":
+            return self.date
+        if field == "severity":
+            return str(self.severity)
+        if field in FIELDS:
+            return getattr(self, field)
+        return default
+
+    def __getitem__(self, field):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return self.get(field)
+
+    def keys(self):
+        return FIELDS
+
+    def __repr__(self):
+        return f"Entry({dict(self)!r})"
+
+
+def as_entry(value):
+    return value if isinstance(value, Entry) else Entry.from_dict(value)
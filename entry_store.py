@@ -0,0 +1,214 @@
+import threading
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+
+from entry_record import as_entry
+from search_index import SearchIndex, check_cancelled, entry_text
+
+# Date-sorted entry store.
+#
+# Dates are parsed once, when an entry enters the store, into an integer sort
+# key (date ordinal in the high bits, insertion sequence in the low bits).
+# Rows stay ordered by that key, so a From/To filter is two bisects and a
+# slice instead of a strptime per entry per keystroke. Entries whose date
+# cannot be parsed sort first under ordinal 0 and, as before, pass any date
+# filter.
+#
+# Ids are expected to be unique (Tracker re-keys duplicates on the way in);
+# _by_id gives O(1) lookup for deletes and updates.
+#
+# Entries are held as compact entry_record.Entry objects; plain dicts passed
+# in are converted on the way in.
+#
+# Filters may run on a worker thread, so reads and writes take the store lock.
+# Bulk inserts (add_many) are only merged into date order on the next read,
+# so an import pays for one sort rather than one per batch.
+#
+# The text index is not built with the store: the first wide text query
+# builds it, or warm_index() builds it from a worker thread after the window
+# is up. Until then changes to the store skip it.
+
+SEQ_BITS = 32
+# Below this fraction of the store, scanning a date slice beats the text index.
+SLICE_SCAN_RATIO = 0.125
+
+
+class EntryStore:
+    def __init__(self, entries=()):
+        self._seq = 0
+        self._key_of = {}
+        self._by_id = {}
+        keyed = [(self._next_key(entry), entry) for entry in map(as_entry, entries)]
+        keyed.sort(key=itemgetter(0))
+        self._keys = array("q", (key for key, _entry in keyed))
+        self._rows = [entry for _key, entry in keyed]
+        self._pending = []
+        self._index = None
+        self.lock = threading.RLock()
+
+    @property
+    def rows(self):
+        with self.lock:
+            self._merge_pending()
+            return self._rows
+
+    @property
+    def index(self):
+        with self.lock:
+            if self._index is None:
+                self._merge_pending()
+                self._index = SearchIndex(self._rows)
+            return self._index
+
+    def warm_index(self):
+        # Builds the index from a snapshot without holding the lock, then
+        # catches it up with whatever changed in the meantime.
+        with self.lock:
+            if self._index is not None:
+                return
+            snapshot = self._rows + [entry for _key, entry in self._pending]
+        index = SearchIndex(snapshot)
+        with self.lock:
+            if self._index is not None:
+                return
+            index.remove_ids({entry.id for entry in snapshot if self._by_id.get(entry.id) is not entry})
+            indexed = {id(entry) for entry in snapshot}
+            for entry in self._by_id.values():
+                if id(entry) not in indexed:
+                    index.add(entry)
+            self._index = index
+
+    def __len__(self):
+        return len(self._rows) + len(self._pending)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def _next_key(self, entry):
+        key = (entry.ordinal << SEQ_BITS) | self._seq
+        self._seq += 1
+        self._key_of[id(entry)] = key
+        self._by_id[entry.id] = entry
+        return key
+
+    @property
+    def ids(self):
+        return self._by_id.keys()
+
+    def get(self, entry_id, default=None):
+        return self._by_id.get(entry_id, default)
+
+    def sort_key(self, entry):
+        return self._key_of[id(entry)]
+
+    def add(self, entry):
+        entry = as_entry(entry)
+        with self.lock:
+            self._merge_pending()
+            key = self._next_key(entry)
+            pos = bisect_left(self._keys, key)
+            self._keys.insert(pos, key)
+            self._rows.insert(pos, entry)
+            if self._index is not None:
+                self._index.add(entry)
+        return pos
+
+    def add_many(self, entries):
+        with self.lock:
+            for entry in map(as_entry, entries):
+                self._pending.append((self._next_key(entry), entry))
+                if self._index is not None:
+                    self._index.add(entry)
+
+    def _merge_pending(self):
+        if not self._pending:
+            return
+        keyed = list(zip(self._keys, self._rows))
+        keyed.extend(self._pending)
+        # Two sorted-ish runs; Timsort merges them in close to linear time.
+        keyed.sort(key=itemgetter(0))
+        self._pending = []
+        self._keys = array("q", (key for key, _entry in keyed))
+        self._rows = [entry for _key, entry in keyed]
+
+    def remove_ids(self, ids):
+        with self.lock:
+            self._merge_pending()
+            return self._remove_ids(set(ids))
+
+    def _remove_ids(self, ids):
+        removed = [self._by_id.pop(entry_id) for entry_id in ids if entry_id in self._by_id]
+        positions = sorted(bisect_left(self._keys, self._key_of.pop(id(entry))) for entry in removed)
+        # Rebuilt from slices rather than edited in place, so readers still
+        # holding the old rows list (exports, the table) are unaffected.
+        keys = array("q")
+        rows = []
+        start = 0
+        for pos in positions + [len(self._rows)]:
+            keys.extend(self._keys[start:pos])
+            rows.extend(self._rows[start:pos])
+            start = pos + 1
+        self._keys = keys
+        self._rows = rows
+        if self._index is not None:
+            self._index.remove_ids(ids)
+        return removed
+
+    def _key_bounds(self, from_date, to_date):
+        lo_key = from_date.toordinal() << SEQ_BITS if from_date else 0
+        hi_key = (to_date.toordinal() + 1) << SEQ_BITS if to_date else None
+        return lo_key, hi_key
+
+    def range(self, from_date=None, to_date=None):
+        with self.lock:
+            self._merge_pending()
+            return self._range(from_date, to_date)
+
+    def _range(self, from_date, to_date):
+        lo_key, hi_key = self._key_bounds(from_date, to_date)
+        lo = bisect_left(self._keys, lo_key)
+        hi = bisect_left(self._keys, hi_key) if hi_key is not None else len(self._keys)
+        undated = bisect_left(self._keys, 1 << SEQ_BITS)
+        if lo <= undated:
+            return self._rows[:hi]
+        return self._rows[:undated] + self._rows[lo:hi]
+
+    def matches(self, entry, text="", from_date=None, to_date=None):
+        key = self._key_of[id(entry)]
+        if key >> SEQ_BITS:
+            lo_key, hi_key = self._key_bounds(from_date, to_date)
+            if key < lo_key or (hi_key is not None and key >= hi_key):
+                return False
+        text = text.strip().lower()
+        return not text or text in entry_text(entry)
+
+    def query(self, text="", from_date=None, to_date=None, cancelled=None):
+        with self.lock:
+            self._merge_pending()
+            return self._query(text.strip().lower(), from_date, to_date, cancelled)
+
+    def _query(self, text, from_date, to_date, cancelled):
+        rows = self._range(from_date, to_date)
+        if not text:
+            return rows
+        if len(rows) <= len(self._rows) * SLICE_SCAN_RATIO:
+            results = []
+            for step, entry in enumerate(rows):
+                check_cancelled(cancelled, step)
+                if text in entry_text(entry):
+                    results.append(entry)
+            return results
+
+        # Wide ranges: let the index find the matches, then keep those inside the range.
+        lo_key, hi_key = self._key_bounds(from_date, to_date)
+        results = []
+        for entry in self.index.search(text, cancelled):
+            key = self._key_of[id(entry)]
+            if key >> SEQ_BITS == 0 or (key >= lo_key and (hi_key is None or key < hi_key)):
+                results.append(entry)
+        results.sort(key=lambda entry: self._key_of[id(entry)])
+        return results
@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from tb_engine import COLUMNS, simulate_array
+from tb_spread_sim import Params, params_key
+from tb_stream import NpySink
+
+# Content-addressed cache of TB toy model trajectories.
+#
+# A run is stored under params_key(p) as two files in the cache directory:
+#
+#   <key>.npy    float64 (days + 1, 4) history, columns S, L, A, R
+#   <key>.json   the Params fields, for listing and lookups
+#
+# The same parameters always map to the same files, so repeated runs and
+# sweeps are a file read. Each hit touches the files' modification time, and
+# when the directory grows past max_bytes the least recently used runs are
+# deleted. Files are written to a temporary name and renamed, so a crash
+# never leaves a half-written run behind. writer(p) is a tb_stream sink, so a
+# run can be cached while it is simulated without holding its history.
+#
+# The directory is TB_CACHE_DIR or experiments/tb_cache, whatever the working
+# directory; the size limit is TB_CACHE_MB (default 256). Bump FORMAT when
+# step() changes so old trajectories miss.
+
+CACHE_DIR_ENV = "TB_CACHE_DIR"
+CACHE_MB_ENV = "TB_CACHE_MB"
+DEFAULT_DIR = Path(__file__).resolve().parent / "tb_cache"
+DEFAULT_MB = 256
+FORMAT = 1
+
+
+class RunCache:
+    def __init__(self, root=None, max_bytes: Optional[int] = None):
+        self.root = Path(root or os.environ.get(CACHE_DIR_ENV) or DEFAULT_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get(CACHE_MB_ENV) or DEFAULT_MB) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+    def paths(self, key: str) -> Tuple[Path, Path]:
+        return self.root / f"{key}.npy", self.root / f"{key}.json"
+
+    def get(self, p: Params, mmap: bool = False) -> Optional[np.ndarray]:
+        return self.get_key(params_key(p), mmap)
+
+    def get_key(self, key: str, mmap: bool = False) -> Optional[np.ndarray]:
+        data_path, meta_path = self.paths(key)
+        try:
+            with meta_path.open("r", encoding="utf-8") as handle:
+                if json.load(handle).get("format") != FORMAT:
+                    return None
+            array = np.load(data_path, mmap_mode="r" if mmap else None)
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        for path in (data_path, meta_path):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        return array
+
+    def _temp_paths(self, key: str) -> Tuple[Path, Path]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        return tuple(path.with_name(path.name + suffix) for path in self.paths(key))
+
+    def _commit(self, p: Params, key: str, data_tmp: Path, evict: bool) -> None:
+        data_path, meta_path = self.paths(key)
+        meta_tmp = meta_path.with_name(meta_path.name + data_tmp.name[len(data_path.name):])
+        with meta_tmp.open("w", encoding="utf-8") as handle:
+            json.dump({"format": FORMAT, "key": key, "params": asdict(p)}, handle, indent=2)
+        # Data first: a run only counts as cached once its metadata exists.
+        os.replace(data_tmp, data_path)
+        os.replace(meta_tmp, meta_path)
+        if evict:
+            self.evict()
+
+    def put(self, p: Params, history: np.ndarray, evict: bool = True) -> str:
+        key = params_key(p)
+        data_tmp, _ = self._temp_paths(key)
+        with data_tmp.open("wb") as handle:
+            np.save(handle, np.ascontiguousarray(history, dtype=np.float64))
+        self._commit(p, key, data_tmp, evict)
+        return key
+
+    def writer(self, p: Params) -> "CacheWriter":
+        # A tb_stream sink that stores the daily rows it is fed as this run.
+        return CacheWriter(self, p)
+
+    def get_or_run(self, p: Params, run: Optional[Callable[[Params], np.ndarray]] = None) -> np.ndarray:
+        history = self.get(p)
+        if history is None:
+            if run is None:
+                run = simulate_array
+            history = run(p)
+            self.put(p, history)
+        return history
+
+    def entries(self) -> Iterator[Tuple[str, dict]]:
+        if not self.root.is_dir():
+            return
+        for meta_path in sorted(self.root.glob("*.json")):
+            try:
+                with meta_path.open("r", encoding="utf-8") as handle:
+                    meta = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            yield meta_path.stem, meta
+
+    def size(self) -> int:
+        if not self.root.is_dir():
+            return 0
+        return sum(path.stat().st_size for path in self.root.iterdir() if path.is_file())
+
+    def evict(self) -> int:
+        # Removes least recently used runs until the directory fits max_bytes.
+        if not self.root.is_dir():
+            return 0
+        runs = {}
+        total = 0
+        for path in self.root.iterdir():
+            if path.suffix not in (".npy", ".json"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            total += stat.st_size
+            used, size = runs.get(path.stem, (0.0, 0))
+            runs[path.stem] = (max(used, stat.st_mtime), size + stat.st_size)
+        removed = 0
+        for key, (_, size) in sorted(runs.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            # Metadata first, so a concurrent reader sees a miss rather than a torn run.
+            for path in self.paths(key)[::-1]:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        if self.root.is_dir():
+            for path in self.root.iterdir():
+                if path.suffix in (".npy", ".json", ".tmp"):
+                    path.unlink()
+                    removed += 1
+        return removed
+
+
+def iter_rows(history: np.ndarray) -> Iterator[Dict[str, float]]:
+    # Cached history as the {"day", "S", "L", "A", "R"} rows simulate() yields.
+    for day, values in enumerate(history):
+        yield {"day": day, **dict(zip(COLUMNS, values.tolist()))}
+
+
+class CacheWriter:
+    def __init__(self, cache: RunCache, p: Params):
+        self.cache = cache
+        self.params = p
+        self.key = params_key(p)
+        self.data_tmp, _ = cache._temp_paths(self.key)
+        self.sink = NpySink(self.data_tmp, COLUMNS)
+
+    def write(self, row) -> None:
+        self.sink.write(row)
+
+    def close(self) -> None:
+        self.sink.close()
+        self.cache._commit(self.params, self.key, self.data_tmp, evict=True)
+
+    def abort(self) -> None:
+        self.sink.abort()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the TB run cache")
+    parser.add_argument("--dir", help=f"Cache directory (default: ${CACHE_DIR_ENV} or {DEFAULT_DIR})")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached run")
+    args = parser.parse_args()
+
+    cache = RunCache(args.dir)
+    if args.clear:
+        print(f"Removed {cache.clear()} files from {cache.root}")
+        return
+    defaults = asdict(Params())
+    count = 0
+    for key, meta in cache.entries():
+        changed = {name: value for name, value in meta.get("params", {}).items() if defaults.get(name) != value}
+        print(f"{key}  " + (" ".join(f"{name}={value}" for name, value in changed.items()) or "(defaults)"))
+        count += 1
+    print(f"{count} runs, {cache.size() / 1024 / 1024:.1f} MB of {cache.max_bytes / 1024 / 1024:g} MB in {cache.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import time
+from dataclasses import astuple, fields
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from tb_spread_sim import Params, simulate
+
+# Array-based engine for the TB toy model.
+#
+# Same update as step() in tb_spread_sim.py -- same operations in the same
+# order, including the min() clamps -- but the history lives in one
+# preallocated float64 array instead of a dict per day, and any number of
+# parameter sets advance together along a leading batch dimension:
+#
+#   simulate_array(p)          -> (days + 1, 4)           columns S, L, A, R
+#   simulate_batch([p1, p2])   -> (batch, days + 1, 4)
+#
+# All parameter sets in a batch must share `days`; everything else may vary.
+
+COLUMNS = ("S", "L", "A", "R")
+S, L, A, R = range(4)
+
+
+def param_arrays(params: Sequence[Params]) -> Dict[str, np.ndarray]:
+    # One float64 column per Params field, one row per parameter set.
+    table = np.array([astuple(p) for p in params], dtype=np.float64).reshape(len(params), -1)
+    return {field.name: table[:, i] for i, field in enumerate(fields(Params))}
+
+
+def initial_states(params: Sequence[Params]) -> np.ndarray:
+    p = param_arrays(params)
+    state = np.zeros((len(params), 4))
+    state[:, S] = p["population"] - p["initial_active"] - p["initial_latent"]
+    state[:, L] = p["initial_latent"]
+    state[:, A] = p["initial_active"]
+    return state
+
+
+def step_batch(state: np.ndarray, p: Dict[str, np.ndarray], out: np.ndarray) -> np.ndarray:
+    # state and out are (batch, 4); out may be a view into the history array.
+    s = state[:, S]
+    l = state[:, L]
+    a = state[:, A]
+    r = state[:, R]
+
+    lam = p["beta"] * (a / p["population"])
+
+    new_inf = np.minimum(s, lam * s)
+    new_latent = p["latent_rate"] * new_inf
+    new_active = (1 - p["latent_rate"]) * new_inf
+
+    prog = np.minimum(l, p["prog_rate"] * l)
+    recov = np.minimum(a, p["recovery_rate"] * a)
+    loss = np.minimum(r, p["loss_immunity"] * r)
+
+    out[:, S] = s - new_inf + loss
+    out[:, L] = l + new_latent - prog
+    out[:, A] = a + new_active + prog - recov
+    out[:, R] = r + recov - loss
+    return out
+
+
+def simulate_batch(params: Sequence[Params]) -> np.ndarray:
+    params = list(params)
+    days = {p.days for p in params}
+    if len(days) != 1:
+        raise ValueError("All parameter sets in a batch must have the same days.")
+    days = days.pop()
+
+    p = param_arrays(params)
+    history = np.empty((len(params), days + 1, 4))
+    history[:, 0] = initial_states(params)
+    for day in range(days):
+        step_batch(history[:, day], p, history[:, day + 1])
+    return history
+
+
+def simulate_array(p: Params) -> np.ndarray:
+    return simulate_batch([p])[0]
+
+
+def to_history(array: np.ndarray) -> List[Dict[str, float]]:
+    # Back to simulate()'s list-of-dicts shape, for save_csv() and summarize().
+    return [{"day": day, **dict(zip(COLUMNS, row.tolist()))} for day, row in enumerate(array)]
+
+
+def main():
+    p = Params()
+    reference = np.array([[row[c] for c in COLUMNS] for row in simulate(p)])
+    engine = simulate_array(p)
+    print(f"Max difference vs simulate(): {np.abs(reference - engine).max():.3g}")
+
+    for batch in (1, 100, 10000):
+        grid = [Params(beta=b) for b in np.linspace(0.05, 0.5, batch).tolist()]
+        start = time.perf_counter()
+        for q in grid[: min(batch, 100)]:
+            simulate(q)
+        loop_s = (time.perf_counter() - start) * batch / min(batch, 100)
+        start = time.perf_counter()
+        simulate_batch(grid)
+        batch_s = time.perf_counter() - start
+        print(f"- {batch:>6} runs: simulate() loop ~{loop_s:.3f} s, simulate_batch() {batch_s:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,138 @@
+import argparse
 import csv
+from array import array
 from pathlib import Path
 
-# Simple plotter for tb_simulation.csv
+try:
+    import numpy as np
+except ImportError:  # the plain csv loader and downsampler below still work
+    np = None
+
+# Simple plotter for tb_simulation.csv, .npy outputs, or any run in the run cache.
 # Uses matplotlib if available; otherwise prints a short summary.
+#
+# Each run is loaded column-wise in one pass: CSV through numpy.loadtxt (or
+# csv.reader into typed arrays without NumPy), .npy files memory-mapped. Before
+# plotting, every line is cut down to at most --max-points points by keeping
+# the minimum and maximum of each bucket, so peaks survive and a million-day
+# run, or several overlaid, draws as fast as a short one.
+
+COLUMNS = ("S", "L", "A", "R")
+LABELS = {"S": "Susceptible (S)", "L": "Latent (L)", "A": "Active (A)", "R": "Recovered (R)"}
+STYLES = {"S": ":", "L": "--", "A": "-", "R": "-."}
+MAX_POINTS = 2000
 
 
-def load_rows(path: Path):
+def load_csv(path):
     with path.open("r", newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        return list(reader)
+        header = next(csv.reader(handle), None)
+        if header is None:
+            return {}
+        if np is not None:
+            table = np.loadtxt(handle, delimiter=",", ndmin=2)
+            if not table.size:
+                return {}
+            return {name: table[:, i] for i, name in enumerate(header)}
+        columns = [array("d") for _ in header]
+        appends = [column.append for column in columns]
+        for row in csv.reader(handle):
+            for append, value in zip(appends, row):
+                append(float(value))
+        return dict(zip(header, columns)) if columns[0] else {}
+
+
+def columns_from_array(table):
+    # (n, 5) day, S, L, A, R from tb_stream, or (n, 4) S, L, A, R from the cache.
+    if table.shape[1] == 4:
+        return {"day": np.arange(len(table)), **{name: table[:, i] for i, name in enumerate(COLUMNS)}}
+    return {name: table[:, i] for i, name in enumerate(("day",) + COLUMNS)}
+
+
+def load_run(path):
+    if path.suffix == ".npy":
+        if np is None:
+            raise SystemExit(f"Reading {path} needs NumPy.")
+        return columns_from_array(np.load(path, mmap_mode="r"))
+    return load_csv(path)
+
+
+def load_cached(overrides, key=None):
+    # Runs from the run cache (tb_cache.py), looked up by parameters or by key.
+    from tb_cache import RunCache
+    from tb_spread_sim import params_key, parse_overrides
+
+    key = key or params_key(parse_overrides(overrides))
+    table = RunCache().get_key(key, mmap=True)
+    if table is None:
+        return key, None
+    return key, columns_from_array(table)
+
 
+def argmax(values):
+    if np is not None:
+        return int(np.argmax(values))
+    return max(range(len(values)), key=values.__getitem__)
 
-def summarize(rows):
-    if not rows:
+
+def minmax_indices(values, max_points=MAX_POINTS):
+    # Indices of the min and max of each of max_points // 2 buckets, plus both ends.
+    n = len(values)
+    if n <= max_points:
+        return range(n)
+    buckets = max(1, max_points // 2)
+    size = -(-n // buckets)
+    if np is None:
+        keep = {0, n - 1}
+        for start in range(0, n, size):
+            bucket = range(start, min(start + size, n))
+            keep.add(min(bucket, key=values.__getitem__))
+            keep.add(max(bucket, key=values.__getitem__))
+        return sorted(keep)
+    values = np.asarray(values)
+    # Pad with the last value so the buckets form a rectangle.
+    padded = np.concatenate([values, np.repeat(values[-1:], buckets * size - n)]).reshape(buckets, size)
+    base = np.arange(buckets) * size
+    keep = np.concatenate([base + padded.argmin(axis=1), base + padded.argmax(axis=1), [0, n - 1]])
+    return np.unique(np.minimum(keep, n - 1))
+
+
+def downsample(days, values, max_points=MAX_POINTS):
+    indices = minmax_indices(values, max_points)
+    if np is not None:
+        return np.asarray(days)[indices], np.asarray(values)[indices]
+    return [days[i] for i in indices], [values[i] for i in indices]
+
+
+def summarize(columns, label="CSV"):
+    if not columns or not len(columns["A"]):
         print("No rows found.")
         return
-    peak = max(rows, key=lambda r: float(r["A"]))
-    end = rows[-1]
-    print("Summary from CSV")
-    print(f"- Peak active TB: {float(peak['A']):.1f} on day {int(float(peak['day']))}")
-    print(
-        f"- End of sim: S={float(end['S']):.1f}, "
-        f"L={float(end['L']):.1f}, A={float(end['A']):.1f}, R={float(end['R']):.1f}"
-    )
+    peak = argmax(columns["A"])
+    print(f"Summary from {label}")
+    print(f"- Peak active TB: {float(columns['A'][peak]):.1f} on day {float(columns['day'][peak]):g}")
+    print("- End of sim: " + ", ".join(f"{name}={float(columns[name][-1]):.1f}" for name in COLUMNS))
 
 
-def plot(rows):
+def plot(runs, columns=COLUMNS, max_points=MAX_POINTS):
+    # runs is a list of (label, columns) pairs; several runs are overlaid.
     try:
         import matplotlib.pyplot as plt
     except Exception:
         print("matplotlib not installed; printing summary instead.")
-        summarize(rows)
+        for label, data in runs:
+            summarize(data, label)
         return
 
-    days = [int(float(r["day"])) for r in rows]
-    s = [float(r["S"]) for r in rows]
-    l = [float(r["L"]) for r in rows]
-    a = [float(r["A"]) for r in rows]
-    r = [float(r["R"]) for r in rows]
-
     plt.figure(figsize=(9, 5))
-    plt.plot(days, s, label="Susceptible (S)")
-    plt.plot(days, l, label="Latent (L)")
-    plt.plot(days, a, label="Active (A)")
-    plt.plot(days, r, label="Recovered (R)")
+    for number, (label, data) in enumerate(runs):
+        if not data:
+            continue
+        for name in columns:
+            days, values = downsample(data["day"], data[name], max_points)
+            if len(runs) == 1:
+                plt.plot(days, values, label=LABELS[name])
+            else:
+                plt.plot(days, values, color=f"C{number % 10}", linestyle=STYLES[name], label=f"{name}: {label}")
     plt.title("TB Toy Simulation")
     plt.xlabel("Day")
     plt.ylabel("People")
@@ -53,12 +142,35 @@ def plot(rows):
 
 
 def main():
-    path = Path("tb_simulation.csv")
-    if not path.exists():
-        print("tb_simulation.csv not found. Run tb_spread_sim.py first.")
-        return
-    rows = load_rows(path)
-    plot(rows)
+    parser = argparse.ArgumentParser(description="Plot one or more TB toy model runs")
+    parser.add_argument("paths", nargs="*", type=Path, help="CSV or .npy outputs (default: tb_simulation.csv)")
+    parser.add_argument("--set", nargs="*", help="Plot the cached run with these Params overrides, e.g. beta=0.3")
+    parser.add_argument("--key", nargs="+", default=[], help="Plot cached runs by key (see tb_cache.py)")
+    parser.add_argument("--columns", default=",".join(COLUMNS), help="Compartments to draw, e.g. A or S,A")
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS, help="Points per line after downsampling")
+    args = parser.parse_args()
+
+    columns = [name.strip() for name in args.columns.split(",")]
+    if any(name not in COLUMNS for name in columns):
+        raise SystemExit(f"--columns takes a comma-separated subset of {','.join(COLUMNS)}")
+
+    runs = []
+    cached = [(args.set, None)] if args.set is not None else []
+    cached += [([], key) for key in args.key]
+    for overrides, key in cached:
+        key, data = load_cached(overrides or [], key)
+        if data is None:
+            print(f"No cached run {key}. Run tb_spread_sim.py with the same --set first.")
+            return
+        runs.append((key, data))
+
+    paths = args.paths or ([] if runs else [Path("tb_simulation.csv")])
+    for path in paths:
+        if not path.exists():
+            print(f"{path} not found. Run tb_spread_sim.py first.")
+            return
+        runs.append((path.name, load_run(path)))
+    plot(runs, columns, args.max_points)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
+import argparse
 import csv
+import hashlib
 import json
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 # Simple, safe, toy model for TB spread with latent infection.
 # Compartments:
@@ -26,6 +28,14 @@ class Params:
     days: int = 365
 
 
+def params_key(p: Params) -> str:
+    # Stable id for a parameter set: the same field values always give the same key
+    # (values are normalized to the declared types, so beta=1 and beta=1.0 match).
+    values = {f.name: f.type(getattr(p, f.name)) for f in fields(p)}
+    text = json.dumps(values, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
 def step(state: Dict[str, float], p: Params) -> Dict[str, float]:
     s = state["S"]
     l = state["L"]
@@ -53,18 +63,39 @@ def step(state: Dict[str, float], p: Params) -> Dict[str, float]:
     return {"S": s_next, "L": l_next, "A": a_next, "R": r_next}
 
 
-def simulate(p: Params) -> List[Dict[str, float]]:
+def step_params(p: Params, dt: float) -> Tuple[int, Params]:
+    # Steps per day for a step of dt days, and p with its daily rates scaled to one step.
+    per_day = round(1 / dt)
+    if per_day < 1 or abs(per_day * dt - 1) > 1e-9:
+        raise ValueError("dt must divide one day evenly (1, 0.5, 0.1, ...).")
+    if per_day > 1:
+        p = replace(
+            p,
+            beta=p.beta / per_day,
+            prog_rate=p.prog_rate / per_day,
+            recovery_rate=p.recovery_rate / per_day,
+            loss_immunity=p.loss_immunity / per_day,
+        )
+    return per_day, p
+
+
+def iter_states(p: Params, dt: float = 1.0) -> Iterator[Dict[str, float]]:
+    # Yields {"day", "S", "L", "A", "R"} for day 0..days, one state at a time.
+    # dt < 1 takes 1/dt smaller steps per day (rates scaled by dt) and yields each.
+    per_day, p = step_params(p, dt)
+
     s0 = p.population - p.initial_active - p.initial_latent
     state = {"S": float(s0), "L": float(p.initial_latent), "A": float(p.initial_active), "R": 0.0}
-
-    history = []
-    for day in range(p.days + 1):
-        history.append({"day": day, **state})
+    for n in range(p.days * per_day + 1):
+        yield {"day": n if per_day == 1 else n / per_day, **state}
         state = step(state, p)
-    return history
 
 
-def save_csv(history: List[Dict[str, float]], path: str) -> None:
+def simulate(p: Params) -> List[Dict[str, float]]:
+    return list(iter_states(p))
+
+
+def save_csv(history: Iterable[Dict[str, float]], path: str) -> None:
     with open(path, "w", newline="", encoding="utf-8") as handle:
         writer = csv.DictWriter(handle, fieldnames=["day", "S", "L", "A", "R"])
         writer.writeheader()
@@ -72,26 +103,97 @@ def save_csv(history: List[Dict[str, float]], path: str) -> None:
             writer.writerow(row)
 
 
-def summarize(history: List[Dict[str, float]]) -> str:
-    peak = max(history, key=lambda r: r["A"])
-    end = history[-1]
-    lines = []
-    lines.append("Summary (toy model)")
-    lines.append(f"- Peak active TB: {peak['A']:.1f} on day {peak['day']}")
-    lines.append(f"- End of sim: S={end['S']:.1f}, L={end['L']:.1f}, A={end['A']:.1f}, R={end['R']:.1f}")
-    return "\n".join(lines)
+class Summary:
+    # Running peak and final state; feed rows one at a time with write().
+    def __init__(self):
+        self.peak = None
+        self.end = None
+
+    def write(self, row: Dict[str, float]) -> None:
+        if self.peak is None or row["A"] > self.peak["A"]:
+            self.peak = row
+        self.end = row
+
+    def close(self) -> None:
+        pass
+
+    def text(self) -> str:
+        peak, end = self.peak, self.end
+        lines = []
+        lines.append("Summary (toy model)")
+        lines.append(f"- Peak active TB: {peak['A']:.1f} on day {peak['day']}")
+        lines.append(f"- End of sim: S={end['S']:.1f}, L={end['L']:.1f}, A={end['A']:.1f}, R={end['R']:.1f}")
+        return "\n".join(lines)
+
+
+def summarize(history: Iterable[Dict[str, float]]) -> str:
+    summary = Summary()
+    for row in history:
+        summary.write(row)
+    return summary.text()
+
+
+def parse_overrides(items: List[str]) -> Params:
+    # name=value pairs on top of the defaults, e.g. ["beta=0.3", "days=730"].
+    types = {f.name: f.type for f in fields(Params)}
+    values = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if name not in types or not value:
+            raise SystemExit(f"Expected <field>=<value> with a Params field, got {item!r}")
+        values[name] = types[name](float(value))
+    return Params(**values)
+
+
+def open_cache():
+    # The run cache (tb_cache.py) needs NumPy; without it every run is computed.
+    try:
+        from tb_cache import RunCache
+    except ImportError:
+        return None
+    return RunCache()
 
 
 def main():
-    p = Params()
-    history = simulate(p)
-    save_csv(history, "tb_simulation.csv")
+    from tb_stream import CsvSink, Every, NpySink, run_pipeline
+
+    parser = argparse.ArgumentParser(description="Run the TB toy model")
+    parser.add_argument("--set", nargs="*", default=[], help="Params overrides, e.g. beta=0.3 days=730")
+    parser.add_argument("--dt", type=float, default=1.0, help="Step size in days, e.g. 0.1 for ten steps a day")
+    parser.add_argument("--every", type=float, default=1.0, help="Write one row every N days to the output files")
+    parser.add_argument("--binary", help="Also write the rows to this .npy file")
+    parser.add_argument("--no-cache", action="store_true", help="Always recompute instead of using the run cache")
+    args = parser.parse_args()
+
+    p = parse_overrides(args.set)
+    summary = Summary()
+    sinks = [Every(args.every, CsvSink("tb_simulation.csv")), summary]
+    if args.binary:
+        sinks.append(Every(args.every, NpySink(args.binary)))
+
+    # Only daily runs are cached; a hit is streamed from the memory-mapped file.
+    rows = None
+    cache = None if args.no_cache or args.dt != 1 else open_cache()
+    if cache is not None:
+        array = cache.get(p, mmap=True)
+        if array is not None:
+            from tb_cache import iter_rows
+            rows = iter_rows(array)
+        else:
+            sinks.append(cache.writer(p))
+    hit = rows is not None
+    if rows is None:
+        rows = iter_states(p, args.dt)
+    run_pipeline(rows, sinks)
 
     with open("tb_simulation_params.json", "w", encoding="utf-8") as handle:
         json.dump(p.__dict__, handle, indent=2)
 
-    print(summarize(history))
-    print("\nWrote tb_simulation.csv and tb_simulation_params.json")
+    print(summary.text())
+    if hit:
+        print(f"\n(Loaded from the run cache, key {params_key(p)})")
+    outputs = ["tb_simulation.csv", "tb_simulation_params.json"] + ([args.binary] if args.binary else [])
+    print(f"\nWrote {', '.join(outputs[:-1])} and {outputs[-1]}")
 
 
 if __name__ == "__main__":
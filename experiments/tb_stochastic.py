@@ -0,0 +1,196 @@
+import argparse
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from tb_engine import COLUMNS, S, L, A, R, simulate_array
+from tb_spread_sim import Params, params_key
+from tb_sweep import parse_assignments, parse_values, typed
+
+# Stochastic (Monte Carlo) version of the TB toy model.
+#
+# Each replicate is a population of whole people. Every day the flows of
+# step() are drawn instead of computed: each susceptible is infected with
+# probability min(1, lam), each new infection goes latent with probability
+# latent_rate, and each L, A and R person moves on with probability prog_rate,
+# recovery_rate and loss_immunity. The expected flows match step(), so the
+# ensemble mean follows the deterministic run while it stays far from zero,
+# but small outbreaks can now die out.
+#
+# All replicates of one parameter set advance together as arrays. Only the
+# current day is kept; after each day its percentiles across replicates are
+# written into the bands, so memory grows with days but not with replicates x
+# days. Several parameter sets run on a process pool, each with its own RNG
+# stream spawned from one seed, so results are reproducible and independent of
+# the number of workers.
+
+QUANTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class Ensemble:
+    params: Params
+    replicates: int
+    quantiles: Tuple[float, ...]
+    bands: np.ndarray      # (days + 1, len(quantiles), 4) percentiles of S, L, A, R
+    mean: np.ndarray       # (days + 1, 4)
+    extinct: np.ndarray    # (days + 1,) share of replicates with L + A == 0
+    peak_A: np.ndarray     # (replicates,) highest A reached by each replicate
+    peak_day: np.ndarray   # (replicates,) day of that peak
+
+    @property
+    def extinction_probability(self) -> float:
+        return float(self.extinct[-1])
+
+
+def initial_counts(p: Params, replicates: int) -> np.ndarray:
+    state = np.zeros((replicates, 4), dtype=np.int64)
+    state[:, S] = p.population - p.initial_active - p.initial_latent
+    state[:, L] = p.initial_latent
+    state[:, A] = p.initial_active
+    return state
+
+
+def step_counts(state: np.ndarray, p: Params, rng: np.random.Generator) -> np.ndarray:
+    # state is (replicates, 4) integer counts; returns the next day's counts.
+    s = state[:, S]
+    l = state[:, L]
+    a = state[:, A]
+    r = state[:, R]
+
+    lam = np.minimum(1.0, p.beta * (a / p.population))
+
+    new_inf = rng.binomial(s, lam)
+    new_latent = rng.binomial(new_inf, p.latent_rate)
+    new_active = new_inf - new_latent
+
+    prog = rng.binomial(l, min(1.0, p.prog_rate))
+    recov = rng.binomial(a, min(1.0, p.recovery_rate))
+    loss = rng.binomial(r, min(1.0, p.loss_immunity))
+
+    out = np.empty_like(state)
+    out[:, S] = s - new_inf + loss
+    out[:, L] = l + new_latent - prog
+    out[:, A] = a + new_active + prog - recov
+    out[:, R] = r + recov - loss
+    return out
+
+
+def run_ensemble(
+    p: Params,
+    replicates: int,
+    seed=0,
+    quantiles: Sequence[float] = QUANTILES,
+) -> Ensemble:
+    # seed may be an int or a np.random.SeedSequence.
+    rng = np.random.default_rng(seed)
+    quantiles = tuple(quantiles)
+    bands = np.empty((p.days + 1, len(quantiles), 4))
+    mean = np.empty((p.days + 1, 4))
+    extinct = np.empty(p.days + 1)
+    peak_A = np.zeros(replicates, dtype=np.int64)
+    peak_day = np.zeros(replicates, dtype=np.int64)
+
+    state = initial_counts(p, replicates)
+    for day in range(p.days + 1):
+        if day:
+            state = step_counts(state, p, rng)
+        bands[day] = np.percentile(state, quantiles, axis=0)
+        mean[day] = state.mean(axis=0)
+        extinct[day] = np.count_nonzero(state[:, L] + state[:, A] == 0) / replicates
+        higher = state[:, A] > peak_A
+        peak_A[higher] = state[higher, A]
+        peak_day[higher] = day
+    return Ensemble(p, replicates, quantiles, bands, mean, extinct, peak_A, peak_day)
+
+
+def _run_one(job) -> Ensemble:
+    p, replicates, seed, quantiles = job
+    return run_ensemble(p, replicates, seed, quantiles)
+
+
+def run_ensembles(
+    runs: Sequence[Params],
+    replicates: int,
+    seed: int = 0,
+    quantiles: Sequence[float] = QUANTILES,
+    workers: int = 0,
+) -> List[Ensemble]:
+    # One independent stream per parameter set, fixed by its position in runs.
+    streams = np.random.SeedSequence(seed).spawn(len(runs))
+    jobs = [(p, replicates, stream, tuple(quantiles)) for p, stream in zip(runs, streams)]
+    if len(jobs) == 1 or workers == 1:
+        return [_run_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        return list(pool.map(_run_one, jobs))
+
+
+def save_bands(ensemble: Ensemble, path: Path) -> None:
+    labels = [f"p{q:g}" for q in ensemble.quantiles]
+    header = ["day"]
+    for column in COLUMNS:
+        header += [f"{column}_mean"] + [f"{column}_{label}" for label in labels]
+    header.append("extinct")
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        for day in range(len(ensemble.mean)):
+            row = [day]
+            for c in range(4):
+                row.append(f"{ensemble.mean[day, c]:.4f}")
+                row.extend(f"{value:g}" for value in ensemble.bands[day, :, c])
+            row.append(f"{ensemble.extinct[day]:.4f}")
+            writer.writerow(row)
+
+
+def summarize(ensemble: Ensemble) -> str:
+    p = ensemble.params
+    low, mid, high = np.percentile(ensemble.peak_A, [5, 50, 95])
+    lines = []
+    lines.append(f"Ensemble of {ensemble.replicates} runs (initial_active={p.initial_active}, beta={p.beta:g})")
+    lines.append(f"- Extinct by day {p.days}: {ensemble.extinction_probability:.1%}")
+    lines.append(f"- Peak active TB: median {mid:.0f} (5-95%: {low:.0f}-{high:.0f})")
+    lines.append(f"- Deterministic peak: {simulate_array(p)[:, A].max():.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo ensembles of the TB toy model")
+    parser.add_argument("--replicates", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quantiles", default=",".join(str(q) for q in QUANTILES), help="Percentiles per day, e.g. 5,50,95")
+    parser.add_argument("--set", nargs="*", default=[], help="Fixed Params overrides, e.g. initial_active=2 days=730")
+    parser.add_argument("--vary", metavar="FIELD=VALUES", help="One ensemble per value, e.g. initial_active=1,2,5,10")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes for --vary (default: all cores)")
+    parser.add_argument("--out", type=Path, default=Path("tb_stochastic.csv"))
+    args = parser.parse_args()
+
+    fixed = parse_assignments(args.set)
+    base = replace(Params(), **{name: typed(name, float(spec)) for name, spec in fixed.items()})
+    runs = [base]
+    if args.vary:
+        (name, spec), = parse_assignments([args.vary]).items()
+        runs = [replace(base, **{name: typed(name, value)}) for value in parse_values(spec)]
+    quantiles = [float(q) for q in args.quantiles.split(",")]
+
+    start = time.perf_counter()
+    ensembles = run_ensembles(runs, args.replicates, args.seed, quantiles, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for ensemble in ensembles:
+        path = args.out
+        if len(ensembles) > 1:
+            path = args.out.with_name(f"{args.out.stem}_{params_key(ensemble.params)}{args.out.suffix}")
+        save_bands(ensemble, path)
+        print(summarize(ensemble))
+        print(f"- Bands written to {path}\n")
+    print(f"{len(ensembles) * args.replicates} runs in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import csv
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Sequence
+
+# Streaming output for the TB toy model.
+#
+# iter_states() in tb_spread_sim.py yields one state at a time; run_pipeline()
+# hands each state to every sink in a single pass, so memory stays the same
+# whatever the number of days or steps. Sinks have write(row) and close():
+#
+#   CsvSink(path)         the tb_simulation.csv format
+#   NpySink(path)         a float64 .npy file written incrementally; np.load()
+#                         and np.load(mmap_mode="r") read it like any array
+#   Summary()             running peak / end state (tb_spread_sim.py)
+#   Every(days, sink)     passes on one row every `days` days plus the last one
+#
+# Nothing here needs NumPy.
+
+ROW_FIELDS = ("day", "S", "L", "A", "R")
+# Space reserved for the .npy header so it can be rewritten with the final
+# row count on close; a multiple of 64 as the format requires.
+NPY_HEADER_BYTES = 128
+NPY_BUFFER_ROWS = 4096
+
+
+class CsvSink:
+    def __init__(self, path, fields: Sequence[str] = ROW_FIELDS):
+        self.handle = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.handle, fieldnames=list(fields), extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, row: Dict[str, float]) -> None:
+        self.writer.writerow(row)
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+class NpySink:
+    def __init__(self, path, fields: Sequence[str] = ROW_FIELDS):
+        self.fields = tuple(fields)
+        self.rows = 0
+        self.buffer = array("d")
+        self.handle = open(path, "wb")
+        self.handle.write(self._header())
+
+    def _header(self) -> bytes:
+        descr = "<f8" if sys.byteorder == "little" else ">f8"
+        text = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({self.rows}, {len(self.fields)}), }}"
+        text = text.ljust(NPY_HEADER_BYTES - 10 - 1) + "\n"
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(text)) + text.encode("latin1")
+
+    def write(self, row: Dict[str, float]) -> None:
+        self.buffer.extend(row[name] for name in self.fields)
+        self.rows += 1
+        if len(self.buffer) >= NPY_BUFFER_ROWS * len(self.fields):
+            self.buffer.tofile(self.handle)
+            del self.buffer[:]
+
+    def close(self) -> None:
+        self.buffer.tofile(self.handle)
+        del self.buffer[:]
+        self.handle.seek(0)
+        self.handle.write(self._header())
+        self.handle.close()
+
+    def abort(self) -> None:
+        self.handle.close()
+        os.remove(self.handle.name)
+
+
+class Every:
+    def __init__(self, days: float, sink):
+        self.days = days
+        self.sink = sink
+        self.next_day = None
+        self.pending = None
+
+    def write(self, row: Dict[str, float]) -> None:
+        # Sub-day steps land on fractional days, hence the small tolerance.
+        if self.next_day is None or row["day"] >= self.next_day - 1e-9:
+            self.sink.write(row)
+            self.next_day = row["day"] + self.days
+            self.pending = None
+        else:
+            self.pending = row
+
+    def close(self) -> None:
+        if self.pending is not None:
+            self.sink.write(self.pending)
+        self.sink.close()
+
+    def abort(self) -> None:
+        getattr(self.sink, "abort", self.sink.close)()
+
+
+def run_pipeline(rows: Iterable[Dict[str, float]], sinks) -> int:
+    # Feeds every row to every sink once; on error, sinks with abort() drop their output.
+    count = 0
+    try:
+        for row in rows:
+            for sink in sinks:
+                sink.write(row)
+            count += 1
+    except BaseException:
+        for sink in sinks:
+            getattr(sink, "abort", sink.close)()
+        raise
+    for sink in sinks:
+        sink.close()
+    return count
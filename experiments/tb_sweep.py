@@ -0,0 +1,194 @@
+import argparse
+import csv
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+from tb_cache import RunCache
+from tb_engine import simulate_batch
+from tb_spread_sim import Params, params_key
+
+# Parameter sweeps for the TB toy model.
+#
+#   python tb_sweep.py --grid beta=0.1:0.5:9 recovery_rate=0.02,0.03,0.05
+#   python tb_sweep.py --random 5000 --seed 1 beta=0.05:0.6 prog_rate=0.0001:0.002
+#
+# Grid values are either a list (a,b,c) or start:stop:count; random mode draws
+# uniformly from start:stop. Runs are split into chunks, each chunk simulated
+# as one batch by tb_engine in a worker process, and each run's summary (peak
+# A, peak day, final compartments) is appended to one CSV as soon as its chunk
+# finishes. Rerunning the same command skips runs already in the CSV, so an
+# interrupted sweep resumes where it stopped.
+
+SWEEP_FIELDS = ("beta", "latent_rate", "prog_rate", "recovery_rate", "loss_immunity")
+DEFAULTS = Params()
+PARAM_FIELDS = [f.name for f in fields(Params)]
+SUMMARY_FIELDS = ["peak_A", "peak_day", "final_S", "final_L", "final_A", "final_R"]
+RESULT_FIELDS = ["key"] + PARAM_FIELDS + SUMMARY_FIELDS
+# Upper bound on history values held per chunk (runs x days x 4 floats).
+CHUNK_VALUES = 4_000_000
+MAX_CHUNK_RUNS = 512
+
+
+def typed(name: str, value: float):
+    # Integer fields (population, days, ...) stay integers.
+    return type(getattr(DEFAULTS, name))(value)
+
+
+def parse_values(spec: str) -> List[float]:
+    if ":" in spec:
+        start, stop, count = spec.split(":")
+        return np.linspace(float(start), float(stop), int(count)).tolist()
+    return [float(value) for value in spec.split(",")]
+
+
+def parse_assignments(items: Sequence[str]) -> Dict[str, str]:
+    specs = {}
+    for item in items:
+        name, _, spec = item.partition("=")
+        if name not in PARAM_FIELDS or not spec:
+            raise SystemExit(f"Expected <field>=<values> with a Params field, got {item!r}")
+        specs[name] = spec
+    return specs
+
+
+def grid_params(base: Params, specs: Dict[str, str]) -> Iterator[Params]:
+    names = list(specs)
+    axes = np.meshgrid(*(parse_values(specs[name]) for name in names), indexing="ij")
+    for combo in np.array(axes).reshape(len(names), -1).T:
+        yield replace(base, **{name: typed(name, value) for name, value in zip(names, combo.tolist())})
+
+
+def random_params(base: Params, specs: Dict[str, str], count: int, seed: int) -> Iterator[Params]:
+    rng = random.Random(seed)
+    bounds = {}
+    for name, spec in specs.items():
+        start, _, stop = spec.partition(":")
+        bounds[name] = (float(start), float(stop or start))
+    for _ in range(count):
+        yield replace(base, **{name: typed(name, rng.uniform(low, high)) for name, (low, high) in bounds.items()})
+
+
+def summarize_batch(history: np.ndarray) -> np.ndarray:
+    # history is (batch, days + 1, 4); returns one row of SUMMARY_FIELDS per run.
+    active = history[:, :, 2]
+    peak_day = active.argmax(axis=1)
+    peak = active[np.arange(len(active)), peak_day]
+    return np.column_stack([peak, peak_day, history[:, -1, :]])
+
+
+def run_chunk(chunk: List[Dict[str, float]], cache_dir: Optional[str] = None) -> List[Dict[str, object]]:
+    params = [Params(**values) for values in chunk]
+    if cache_dir is None:
+        history = simulate_batch(params)
+    else:
+        # Only cache misses are simulated; new trajectories are added to the cache.
+        cache = RunCache(cache_dir)
+        cached = [cache.get(p) for p in params]
+        misses = [i for i, array in enumerate(cached) if array is None]
+        if misses:
+            for i, array in zip(misses, simulate_batch([params[i] for i in misses])):
+                cache.put(params[i], array, evict=False)
+                cached[i] = array
+        history = np.stack(cached)
+    summaries = summarize_batch(history)
+    rows = []
+    for p, summary in zip(params, summaries.tolist()):
+        row = {"key": params_key(p), **asdict(p), **dict(zip(SUMMARY_FIELDS, summary))}
+        row["peak_day"] = int(row["peak_day"])
+        rows.append(row)
+    return rows
+
+
+def completed_keys(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    # A kill mid-write can leave a partial last line; cut it off before appending.
+    with path.open("rb+") as handle:
+        data = handle.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            handle.truncate(end)
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        return {row["key"] for row in csv.DictReader(handle) if row.get("final_R")}
+
+
+def chunked(runs: List[Params], size: int) -> Iterator[List[Dict[str, float]]]:
+    for start in range(0, len(runs), size):
+        yield [asdict(p) for p in runs[start:start + size]]
+
+
+def run_sweep(runs: List[Params], out_path: Path, workers: int = 0, cache: Optional[RunCache] = None) -> int:
+    done = completed_keys(out_path)
+    todo = {params_key(p): p for p in runs if params_key(p) not in done}
+    runs = list(todo.values())
+    if not runs:
+        return 0
+
+    # Batches need one horizon each, so runs are grouped by days first.
+    runs.sort(key=lambda p: p.days)
+    chunks = []
+    for days in sorted({p.days for p in runs}):
+        group = [p for p in runs if p.days == days]
+        # Small enough to bound memory and to give every worker several chunks.
+        per_worker = -(-len(group) // (4 * (workers or os.cpu_count() or 1)))
+        size = max(1, min(MAX_CHUNK_RUNS, CHUNK_VALUES // (4 * (days + 1)), per_worker))
+        chunks.extend(chunked(group, size))
+
+    new_file = not out_path.exists() or out_path.stat().st_size == 0
+    written = 0
+    with out_path.open("a", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            cache_dir = None if cache is None else str(cache.root)
+            futures = [pool.submit(run_chunk, chunk, cache_dir) for chunk in chunks]
+            for future in as_completed(futures):
+                rows = future.result()
+                writer.writerows(rows)
+                handle.flush()
+                written += len(rows)
+                print(f"\r{written}/{len(runs)} runs", end="", flush=True)
+    print()
+    if cache is not None:
+        cache.evict()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep TB toy model parameters across all cores")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--grid", action="store_true", help="Every combination of the listed values")
+    mode.add_argument("--random", type=int, metavar="N", help="N uniform random samples from start:stop ranges")
+    parser.add_argument("specs", nargs="+", help=f"field=values, e.g. beta=0.1:0.5:9 (usually one of {', '.join(SWEEP_FIELDS)})")
+    parser.add_argument("--set", nargs="*", default=[], help="Fixed overrides for the other fields, e.g. days=730")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", type=Path, default=Path("tb_sweep.csv"))
+    parser.add_argument("--cache", action="store_true", help="Reuse and store full trajectories in the run cache")
+    args = parser.parse_args()
+
+    fixed = parse_assignments(args.set)
+    base = replace(DEFAULTS, **{name: typed(name, float(spec)) for name, spec in fixed.items()})
+    specs = parse_assignments(args.specs)
+    if args.grid:
+        runs = list(grid_params(base, specs))
+    else:
+        runs = list(random_params(base, specs, args.random, args.seed))
+
+    written = run_sweep(runs, args.out, args.workers, RunCache() if args.cache else None)
+    with args.out.with_suffix(".json").open("w", encoding="utf-8") as handle:
+        spec = {"mode": "grid" if args.grid else "random", "specs": specs, "fixed": fixed, "seed": args.seed, "runs": len(runs)}
+        json.dump(spec, handle, indent=2)
+    print(f"Ran {written} new of {len(runs)} runs; results in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import queue
+import threading
+
+from search_index import QueryCancelled
+
+# Debounced, cancellable filtering off the Tk main loop.
+#
+# submit() (re)arms a debounce timer; when it fires the query is handed to a
+# single background thread. Every submit or cancel bumps a generation number:
+# a running query checks it periodically and gives up as soon as it is
+# stale, and results from an old generation are dropped when they reach the
+# main thread. Only the main thread touches Tk; it polls the result queue
+# with after() while a query is in flight.
+
+DEBOUNCE_MS = 150
+POLL_MS = 15
+
+
+class FilterWorker:
+    def __init__(self, widget, run_query, on_result, debounce_ms=DEBOUNCE_MS):
+        self.widget = widget
+        self.run_query = run_query
+        self.on_result = on_result
+        self.debounce_ms = debounce_ms
+        self._generation = 0
+        self._after_id = None
+        self._poll_id = None
+        self._waiting = None
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = None
+
+    @property
+    def busy(self):
+        return self._after_id is not None or self._waiting == self._generation
+
+    def submit(self, *args, debounce=True):
+        self.cancel()
+        generation = self._generation
+        delay = self.debounce_ms if debounce else 0
+        self._after_id = self.widget.after(delay, self._dispatch, generation, args)
+
+    def cancel(self):
+        self._generation += 1
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _dispatch(self, generation, args):
+        self._after_id = None
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, daemon=True)
+            self._thread.start()
+        self._requests.put((generation, args))
+        self._waiting = generation
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
+
+    def _work(self):
+        while True:
+            generation, args = self._requests.get()
+            if generation != self._generation:
+                continue
+
+            def cancelled(generation=generation):
+                return generation != self._generation
+
+            try:
+                result = self.run_query(*args, cancelled=cancelled)
+            except QueryCancelled:
+                continue
+            except Exception as exc:
+                result = exc
+            self._results.put((generation, result))
+
+    def _poll(self):
+        self._poll_id = None
+        result = None
+        found = False
+        while True:
+            try:
+                generation, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                result, found = value, True
+        if found:
+            self._waiting = None
+            if isinstance(result, Exception):
+                raise result
+            self.on_result(result)
+            return
+        # Stop polling once the query we are waiting for has been superseded.
+        if self._waiting == self._generation:
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
@@ -1,45 +1,53 @@
-import json
-import os
-import csv
+import time
+
+# Taken before the remaining imports so startup timings include them.
+STARTED_AT = time.perf_counter()
+
+import importlib
 import sys
 import threading
+from bisect import bisect_left
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime, date
-
-try:
-    import winsound
-except Exception:
-    winsound = None
 
-try:
-    import pystray
-    from PIL import Image, ImageDraw
-except Exception:
-    pystray = None
-    Image = None
-    ImageDraw = None
+from analytics import format_report
+from background_task import BackgroundTask
+from debug_panel import DebugPanel
+from filter_worker import FilterWorker
+from notifications import NotificationCenter
+from perf_trace import spans
+from table_view import VirtualTable
+from tracker_core import (
+    Tracker,
+    ValidationError,
+    make_entry,
+    make_reminder,
+    parse_filter,
+    today_str,
+)
 
 APP_TITLE = "Symptom Tracker"
-DATA_FILE = "data.json"
-REMINDERS_FILE = "reminders.json"
-DATE_FMT = "%Y-%m-%d"
+FILTER_DEBOUNCE_MS = 150
+# The tray icon is set up shortly after the data has started loading.
+TRAY_DELAY_MS = 500
+# How often the status bar's timing readout updates while spans are recorded.
+PERF_READOUT_MS = 500
+TRANSFER_STOP_SECONDS = 5
+# How often the window checks whether background saves are failing.
+SAVE_CHECK_MS = 1000
 
 
-def today_str():
-    return date.today().strftime(DATE_FMT)
+def elapsed_ms():
+    return (time.perf_counter() - STARTED_AT) * 1000
 
 
-def parse_date(value):
+@lru_cache(maxsize=None)
+def optional_module(name):
+    # winsound, pystray and Pillow are only needed later (if at all), so they
+    # are imported on first use instead of delaying the first window paint.
     try:
-        return datetime.strptime(value.strip(), DATE_FMT).date()
-    except Exception:
-        return None
-
-
-def parse_time(value):
-    try:
-        return datetime.strptime(value.strip(), "%H:%M").time()
+        return importlib.import_module(name)
     except Exception:
         return None
 
@@ -51,21 +59,32 @@ class SymptomTrackerApp(tk.Tk):
         self.geometry("980x620")
         self.minsize(880, 560)
 
-        self.data = []
+        self.tracker = Tracker()
         self.filtered = []
-        self.reminders = []
-        self.reminder_last_fired = {}
+        self.active_filter = ("", None, None)
+        self.filter_worker = FilterWorker(self, self._run_filter, self._show_filter_results, FILTER_DEBOUNCE_MS)
+        self.reminder_after_id = None
+        self.notifications = NotificationCenter(self, APP_TITLE, sound=self._beep)
+        self.transfer_task = None
         self.tray_icon = None
         self.tray_thread = None
         self.tray_hint_shown = False
+        self.loading = True
+        self.startup_times = {}
+        self.debug_panel = None
+        self.filter_started = None
+        self.perf_readout_on = False
+        self.save_failing = False
 
         self._build_ui()
+        # Draw the window first; data is parsed in the background afterwards.
+        self.after_idle(self._on_first_paint)
+
+    def _on_first_paint(self):
+        self.startup_times["first_paint_ms"] = elapsed_ms()
+        self.status_var.set("Loading...")
         self._load_data()
-        self._load_reminders()
-        self._refresh_table()
-        self._refresh_reminders()
-        self._schedule_reminder_checks()
-        self._setup_tray()
+        self.after(TRAY_DELAY_MS, self._setup_tray)
 
     def _build_ui(self):
         self.columnconfigure(0, weight=1)
@@ -142,7 +161,7 @@ class SymptomTrackerApp(tk.Tk):
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(filter_frame, textvariable=self.search_var)
         search_entry.grid(row=0, column=1, sticky="ew", pady=4)
-        search_entry.bind("<KeyRelease>", lambda _event: self._apply_filter())
+        search_entry.bind("<KeyRelease>", lambda _event: self._apply_filter(debounce=True))
 
         ttk.Label(filter_frame, text="From").grid(row=1, column=0, sticky="w")
         self.from_var = tk.StringVar()
@@ -198,7 +217,7 @@ class SymptomTrackerApp(tk.Tk):
         self.table.column("triggers", width=220)
 
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
-        self.table.configure(yscrollcommand=scrollbar.set)
+        self.table_view = VirtualTable(self.table, scrollbar, columns)
 
         self.table.grid(row=0, column=0, sticky="nsew")
         scrollbar.grid(row=0, column=1, sticky="ns")
@@ -208,86 +227,131 @@ class SymptomTrackerApp(tk.Tk):
         actions.columnconfigure(0, weight=1)
         actions.columnconfigure(1, weight=1)
         actions.columnconfigure(2, weight=1)
+        actions.columnconfigure(3, weight=1)
+        actions.columnconfigure(4, weight=1)
 
         ttk.Button(actions, text="Delete Selected", command=self._delete_selected).grid(row=0, column=0, sticky="ew", padx=(0, 6))
         ttk.Button(actions, text="Export CSV", command=self._export_csv).grid(row=0, column=1, sticky="ew", padx=(0, 6))
-        ttk.Button(actions, text="Show All", command=self._reset_filter).grid(row=0, column=2, sticky="ew")
+        ttk.Button(actions, text="Import CSV", command=self._import_csv).grid(row=0, column=2, sticky="ew", padx=(0, 6))
+        ttk.Button(actions, text="Trends", command=self._show_trends).grid(row=0, column=3, sticky="ew", padx=(0, 6))
+        ttk.Button(actions, text="Show All", command=self._reset_filter).grid(row=0, column=4, sticky="ew")
 
+        status_bar = ttk.Frame(self, relief="sunken")
+        status_bar.grid(row=2, column=0, sticky="ew")
+        status_bar.columnconfigure(0, weight=1)
         self.status_var = tk.StringVar(value="Ready")
-        status = ttk.Label(self, textvariable=self.status_var, anchor="w", padding=6, relief="sunken")
-        status.grid(row=2, column=0, sticky="ew")
+        ttk.Label(status_bar, textvariable=self.status_var, anchor="w", padding=6).grid(row=0, column=0, sticky="ew")
+        self.perf_var = tk.StringVar(value="")
+        ttk.Label(status_bar, textvariable=self.perf_var, anchor="e", padding=6).grid(row=0, column=1, sticky="e")
+
+        # F12 opens the timing/profiling panel.
+        self.bind("<F12>", lambda _event: self._show_debug_panel())
+        if spans.enabled:
+            self._start_perf_readout()
 
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
-    def _data_path(self):
-        return os.path.join(os.path.dirname(os.path.abspath(__file__)), DATA_FILE)
+    @property
+    def store(self):
+        return self.tracker.store
 
-    def _reminder_path(self):
-        return os.path.join(os.path.dirname(os.path.abspath(__file__)), REMINDERS_FILE)
+    @property
+    def reminders(self):
+        return self.tracker.reminders
 
     def _load_data(self):
-        path = self._data_path()
-        if not os.path.exists(path):
-            self.data = []
-            return
-        try:
-            with open(path, "r", encoding="utf-8") as handle:
-                self.data = json.load(handle)
-        except Exception as exc:
-            messagebox.showwarning("Load Error", f"Could not read data file. Starting fresh.\n\n{exc}")
-            self.data = []
-
-    def _save_data(self):
-        path = self._data_path()
-        with open(path, "w", encoding="utf-8") as handle:
-            json.dump(self.data, handle, indent=2)
-
-    def _load_reminders(self):
-        path = self._reminder_path()
-        if not os.path.exists(path):
-            self.reminders = []
-            return
-        try:
-            with open(path, "r", encoding="utf-8") as handle:
-                self.reminders = json.load(handle)
-        except Exception as exc:
-            messagebox.showwarning("Load Error", f"Could not read reminders file. Starting fresh.\n\n{exc}")
-            self.reminders = []
+        def work(progress, cancelled):
+            # Runs on a worker thread; errors are reported once back on the Tk thread.
+            errors = {}
+            try:
+                with spans.span("load.entries"):
+                    self.tracker.load()
+            except Exception as exc:
+                errors["data"] = exc
+            try:
+                with spans.span("load.reminders"):
+                    self.tracker.load_reminders()
+            except Exception as exc:
+                errors["reminders"] = exc
+            return errors
+
+        started = spans.begin()
+        BackgroundTask(self, work, on_done=lambda errors: self._on_data_loaded(errors, started)).start()
+
+    def _on_data_loaded(self, errors, started=None):
+        spans.end("load", started)
+        self.loading = False
+        if "data" in errors:
+            messagebox.showwarning("Load Error", f"Could not read data file. Starting fresh.\n\n{errors['data']}")
+        if "reminders" in errors:
+            messagebox.showwarning("Load Error", f"Could not read reminders file. Starting fresh.\n\n{errors['reminders']}")
+        self._refresh_reminders()
+        self._schedule_reminder_checks()
+        self._check_saves()
+
+        # The table only builds a window of rows, so this is cheap however much was loaded.
+        if any((self.search_var.get().strip(), self.from_var.get().strip(), self.to_var.get().strip())):
+            self._apply_filter()
+        else:
+            self.filtered = list(self.store.rows)
+            self._refresh_table()
+        self.startup_times["ready_ms"] = elapsed_ms()
+        # The search index is built lazily; warm it now so the first search is instant.
+        threading.Thread(target=self.store.warm_index, daemon=True).start()
+        self.status_var.set(
+            f"Loaded {len(self.store)} entries "
+            f"(first paint {self.startup_times['first_paint_ms']:.0f} ms, ready {self.startup_times['ready_ms']:.0f} ms)"
+        )
+
+    def _check_saves(self):
+        # Saves run on a background thread; poll for failures so they're reported
+        # while the user is still entering data, not only at quit.
+        error = self.tracker.save_error
+        if error is not None:
+            self.status_var.set(f"Changes are not being saved; retrying... ({error})")
+            if not self.save_failing:
+                messagebox.showerror(
+                    "Save Error",
+                    f"Recent changes could not be saved. They are kept and will be retried.\n\n{error}",
+                )
+        elif self.save_failing:
+            self.status_var.set("Saved")
+        self.save_failing = error is not None
+        self.after(SAVE_CHECK_MS, self._check_saves)
 
-    def _save_reminders(self):
-        path = self._reminder_path()
-        with open(path, "w", encoding="utf-8") as handle:
-            json.dump(self.reminders, handle, indent=2)
+    def _still_loading(self):
+        if self.loading:
+            self.status_var.set("Still loading your data...")
+        return self.loading
 
     def _add_entry(self):
-        date_value = self.date_var.get().strip()
-        symptom = self.symptom_var.get().strip()
-        severity = self.severity_var.get().strip()
-        duration = self.duration_var.get().strip()
-        triggers = self.triggers_var.get().strip()
-        notes = self.notes_text.get("1.0", "end").strip()
-
-        parsed_date = parse_date(date_value)
-        if not parsed_date:
-            messagebox.showerror("Invalid Date", "Please enter a valid date in YYYY-MM-DD format.")
+        # _transfer_busy() also covers loading; an import changes the store from its own thread.
+        if self._transfer_busy():
             return
-        if not symptom:
-            messagebox.showerror("Missing Symptom", "Please enter a symptom name.")
+        try:
+            entry = make_entry(
+                self.date_var.get(),
+                self.symptom_var.get(),
+                self.severity_var.get(),
+                self.duration_var.get(),
+                self.triggers_var.get(),
+                self.notes_text.get("1.0", "end"),
+            )
+        except ValidationError as exc:
+            messagebox.showerror(exc.title, exc.message)
             return
 
-        entry = {
-            "id": datetime.utcnow().isoformat(timespec="seconds"),
-            "date": parsed_date.strftime(DATE_FMT),
-            "symptom": symptom,
-            "severity": severity,
-            "duration": duration,
-            "triggers": triggers,
-            "notes": notes,
-        }
-        self.data.append(entry)
-        self._save_data()
+        # A filter still in flight would miss this entry; stop it and run it again afterwards.
+        filter_pending = self.filter_worker.busy
+        self.filter_worker.cancel()
+        with spans.span("add_entry"):
+            self.tracker.add_entry(entry)
         self._clear_form()
-        self._apply_filter()
+        if filter_pending:
+            self.filter_worker.submit(*self.active_filter, debounce=False)
+        elif self.store.matches(entry, *self.active_filter):
+            pos = bisect_left(self.filtered, self.store.sort_key(entry), key=self.store.sort_key)
+            self.table_view.insert(pos, entry)
         self.status_var.set(f"Added entry for {entry['date']}")
 
     def _clear_form(self):
@@ -298,67 +362,43 @@ class SymptomTrackerApp(tk.Tk):
         self.triggers_var.set("")
         self.notes_text.delete("1.0", "end")
 
-    def _apply_filter(self):
-        query = self.search_var.get().strip().lower()
-        from_date = parse_date(self.from_var.get()) if self.from_var.get().strip() else None
-        to_date = parse_date(self.to_var.get()) if self.to_var.get().strip() else None
-
-        if self.from_var.get().strip() and not from_date:
-            self.status_var.set("Invalid 'From' date. Use YYYY-MM-DD.")
-            return
-        if self.to_var.get().strip() and not to_date:
-            self.status_var.set("Invalid 'To' date. Use YYYY-MM-DD.")
+    def _apply_filter(self, debounce=False):
+        try:
+            self.active_filter = parse_filter(self.search_var.get(), self.from_var.get(), self.to_var.get())
+        except ValidationError as exc:
+            self.status_var.set(exc.message)
             return
-
-        results = []
-        for entry in self.data:
-            entry_date = parse_date(entry.get("date", ""))
-            if from_date and entry_date and entry_date < from_date:
-                continue
-            if to_date and entry_date and entry_date > to_date:
-                continue
-
-            if query:
-                haystack = " ".join(
-                    [
-                        entry.get("symptom", ""),
-                        entry.get("triggers", ""),
-                        entry.get("notes", ""),
-                    ]
-                ).lower()
-                if query not in haystack:
-                    continue
-
-            results.append(entry)
-
+        if self.filter_started is None:
+            self.filter_started = spans.begin()
+        self.filter_worker.submit(*self.active_filter, debounce=debounce)
+
+    def _run_filter(self, query, from_date, to_date, cancelled):
+        # Runs on the filter worker thread; must not touch any widgets.
+        with spans.span("filter.query"):
+            return self.tracker.query(query, from_date, to_date, cancelled)
+
+    def _show_filter_results(self, results):
+        # "filter" runs from the first keystroke (debounce included) to the table update.
+        started, self.filter_started = self.filter_started, None
         self.filtered = results
         self._refresh_table()
-        self.status_var.set(f"Showing {len(self.filtered)} of {len(self.data)} entries")
+        spans.end("filter", started)
+        self.status_var.set(f"Showing {len(self.filtered)} of {len(self.store)} entries")
 
     def _reset_filter(self):
         self.search_var.set("")
         self.from_var.set("")
         self.to_var.set("")
-        self.filtered = list(self.data)
+        self.filter_worker.cancel()
+        self.filter_started = None
+        self.active_filter = ("", None, None)
+        self.filtered = list(self.store.rows)
         self._refresh_table()
-        self.status_var.set(f"Showing {len(self.filtered)} of {len(self.data)} entries")
+        self.status_var.set(f"Showing {len(self.filtered)} of {len(self.store)} entries")
 
     def _refresh_table(self):
-        self.table.delete(*self.table.get_children())
-        rows = self.filtered if self.filtered else list(self.data)
-        for entry in rows:
-            self.table.insert(
-                "",
-                "end",
-                iid=entry.get("id"),
-                values=(
-                    entry.get("date", ""),
-                    entry.get("symptom", ""),
-                    entry.get("severity", ""),
-                    entry.get("duration", ""),
-                    entry.get("triggers", ""),
-                ),
-            )
+        with spans.span("refresh_table"):
+            self.table_view.set_rows(self.filtered)
 
     def _refresh_reminders(self):
         self.reminder_list.delete(0, "end")
@@ -367,66 +407,64 @@ class SymptomTrackerApp(tk.Tk):
             self.reminder_list.insert("end", label)
 
     def _add_reminder(self):
-        time_value = self.reminder_time_var.get().strip()
-        message = self.reminder_message_var.get().strip()
-
-        parsed_time = parse_time(time_value)
-        if not parsed_time:
-            messagebox.showerror("Invalid Time", "Please enter a valid time in HH:MM (24h) format.")
+        if self._still_loading():
             return
-        if not message:
-            messagebox.showerror("Missing Message", "Please enter a reminder message.")
+        try:
+            reminder = make_reminder(self.reminder_time_var.get(), self.reminder_message_var.get())
+        except ValidationError as exc:
+            messagebox.showerror(exc.title, exc.message)
             return
 
-        reminder = {
-            "id": datetime.utcnow().isoformat(timespec="seconds"),
-            "time": parsed_time.strftime("%H:%M"),
-            "message": message,
-        }
-        self.reminders.append(reminder)
-        self._save_reminders()
+        self.tracker.add_reminder(reminder)
         self._refresh_reminders()
+        self._schedule_reminder_checks()
         self.reminder_time_var.set("")
         self.reminder_message_var.set("")
         self.status_var.set(f"Added reminder at {reminder['time']}")
 
     def _delete_reminder(self):
+        if self._still_loading():
+            return
         selection = self.reminder_list.curselection()
         if not selection:
             messagebox.showinfo("No Selection", "Select a reminder to remove.")
             return
         index = selection[0]
-        removed = self.reminders.pop(index)
-        self._save_reminders()
+        removed = self.tracker.remove_reminder(index)
         self._refresh_reminders()
+        self._schedule_reminder_checks()
         self.status_var.set(f"Removed reminder at {removed.get('time', '')}")
 
     def _schedule_reminder_checks(self):
+        # Sleep until the next reminder is due; re-armed whenever reminders change.
+        if self.reminder_after_id is not None:
+            self.after_cancel(self.reminder_after_id)
+        delay_ms = int(self.tracker.reminder_scheduler.next_delay() * 1000) + 1
+        self.reminder_after_id = self.after(delay_ms, self._on_reminder_timer)
+
+    def _on_reminder_timer(self):
+        self.reminder_after_id = None
         self._check_reminders()
-        self.after(30000, self._schedule_reminder_checks)
+        self._schedule_reminder_checks()
 
     def _check_reminders(self):
-        if not self.reminders:
-            return
-        now = datetime.now()
-        now_date = now.strftime(DATE_FMT)
-        now_time = now.strftime("%H:%M")
-
-        for reminder in self.reminders:
-            reminder_id = reminder.get("id")
-            if reminder.get("time") != now_time:
-                continue
-            if self.reminder_last_fired.get(reminder_id) == now_date:
-                continue
-            self.reminder_last_fired[reminder_id] = now_date
-            if winsound:
-                try:
-                    winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-                except Exception:
-                    pass
-            messagebox.showinfo("Reminder", reminder.get("message", "Time for your reminder."))
+        with spans.span("check_reminders"):
+            due = self.tracker.due_reminders()
+        for reminder in due:
+            self.notifications.notify(reminder.get("message", "Time for your reminder."))
+
+    def _beep(self):
+        winsound = optional_module("winsound")
+        if winsound:
+            try:
+                winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+            except Exception:
+                pass
 
     def _setup_tray(self):
+        pystray = optional_module("pystray")
+        Image = optional_module("PIL.Image")
+        ImageDraw = optional_module("PIL.ImageDraw")
         if not pystray or not Image or not ImageDraw:
             self.status_var.set("Tray disabled (missing pystray/Pillow).")
             return
@@ -485,10 +523,22 @@ class SymptomTrackerApp(tk.Tk):
                 self.tray_icon.stop()
             except Exception:
                 pass
+        if self.transfer_task:
+            self.transfer_task.cancel()
+            # Let a cancelled import finish its current batch so it reaches the flush below.
+            self.transfer_task.wait(TRANSFER_STOP_SECONDS)
+        try:
+            # Flushes any deferred writes before the process exits.
+            self.tracker.close()
+        except Exception as exc:
+            messagebox.showerror("Save Error", f"Some recent changes could not be saved.\n\n{exc}")
+        spans.flush()
         self.destroy()
         sys.exit(0)
 
     def _delete_selected(self):
+        if self._transfer_busy():
+            return
         selected = self.table.selection()
         if not selected:
             messagebox.showinfo("No Selection", "Select one or more entries to delete.")
@@ -497,39 +547,138 @@ class SymptomTrackerApp(tk.Tk):
             return
 
         ids = set(selected)
-        self.data = [entry for entry in self.data if entry.get("id") not in ids]
-        self._save_data()
-        self._apply_filter()
+        filter_pending = self.filter_worker.busy
+        self.filter_worker.cancel()
+        self.tracker.delete_ids(ids)
+        self.table_view.remove_ids(ids)
+        if filter_pending:
+            self.filter_worker.submit(*self.active_filter, debounce=False)
         self.status_var.set("Deleted selected entries")
 
+    def _show_trends(self):
+        if self._transfer_busy():
+            return
+        if not self.store:
+            messagebox.showinfo("No Data", "Add some entries to see trends.")
+            return
+        try:
+            report = format_report(self.tracker.analytics.results())
+        except RuntimeError as exc:
+            messagebox.showerror("Trends", str(exc))
+            return
+
+        window = tk.Toplevel(self)
+        window.title(f"{APP_TITLE} - Trends")
+        text = tk.Text(window, width=72, height=28, wrap="none", font="TkFixedFont")
+        text.insert("1.0", report)
+        text.configure(state="disabled")
+        text.grid(row=0, column=0, sticky="nsew", padx=12, pady=12)
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+
+    def _show_debug_panel(self):
+        if self.debug_panel is not None and self.debug_panel.window.winfo_exists():
+            self.debug_panel.window.lift()
+            return
+        self.debug_panel = DebugPanel(self, spans)
+        self._start_perf_readout()
+
+    def _start_perf_readout(self):
+        if not self.perf_readout_on:
+            self.perf_readout_on = True
+            self.after(PERF_READOUT_MS, self._update_perf_readout)
+
+    def _update_perf_readout(self):
+        # Polls instead of hooking every span, so recording stays cheap; stops once spans are off.
+        if not spans.enabled:
+            self.perf_readout_on = False
+            self.perf_var.set("")
+            return
+        if spans.last:
+            name, elapsed = spans.last
+            self.perf_var.set(f"{name} {elapsed:.1f} ms")
+        self.after(PERF_READOUT_MS, self._update_perf_readout)
+
+    def _transfer_busy(self):
+        if self._still_loading():
+            return True
+        if self.transfer_task and self.transfer_task.running:
+            messagebox.showinfo("Busy", "Wait for the current import or export to finish.")
+            return True
+        return False
+
+    def _start_transfer(self, label, work, on_done, error_title):
+        def on_progress(fraction):
+            self.status_var.set(f"{label}... {fraction * 100:.0f}%")
+
+        def on_error(exc):
+            messagebox.showerror(error_title, f"{error_title}.\n\n{exc}")
+            self.status_var.set("Ready")
+
+        self.status_var.set(f"{label}...")
+        self.transfer_task = BackgroundTask(self, work, on_progress, on_done, on_error).start()
+
     def _export_csv(self):
-        if not self.data:
+        if self._still_loading():
+            return
+        if not self.store:
             messagebox.showinfo("No Data", "Add at least one entry before exporting.")
             return
+        if self._transfer_busy():
+            return
+
+        entries = self.store.rows
+        if any(self.active_filter) and len(self.filtered) < len(self.store):
+            choice = messagebox.askyesnocancel(
+                "Export CSV",
+                f"Export only the {len(self.filtered)} entries matching the current filter?\n\n"
+                f"Choose No to export all {len(self.store)} entries.",
+            )
+            if choice is None:
+                return
+            if choice:
+                entries = self.filtered
+        # Snapshot the rows so edits made during the export don't shift the chunks.
+        entries = list(entries)
 
         default_name = f"symptom-tracker-{today_str()}.csv"
         path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv")],
+            filetypes=[("CSV Files", "*.csv"), ("Columnar NumPy Files", "*.npz")],
             initialfile=default_name,
         )
         if not path:
             return
 
-        try:
-            with open(path, "w", newline="", encoding="utf-8") as handle:
-                writer = csv.DictWriter(
-                    handle,
-                    fieldnames=["date", "symptom", "severity", "duration", "triggers", "notes"],
-                )
-                writer.writeheader()
-                for entry in self.data:
-                    writer.writerow(entry)
-        except Exception as exc:
-            messagebox.showerror("Export Failed", f"Could not export CSV.\n\n{exc}")
+        def work(progress, cancelled):
+            with spans.span("export"):
+                return self.tracker.export_file(path, entries, progress, cancelled)
+
+        def on_done(count):
+            self.status_var.set(f"Exported {count} entries to {path}")
+
+        self._start_transfer("Exporting CSV", work, on_done, "Could not export CSV")
+
+    def _import_csv(self):
+        if self._transfer_busy():
             return
+        path = filedialog.askopenfilename(
+            filetypes=[("CSV Files", "*.csv"), ("JSON Files", "*.json"), ("Columnar NumPy Files", "*.npz")]
+        )
+        if not path:
+            return
+
+        def work(progress, cancelled):
+            with spans.span("import"):
+                return self.tracker.import_file(path, progress=progress, cancelled=cancelled)
+
+        def on_done(result):
+            imported, rejected = result
+            self._apply_filter()
+            skipped = f", skipped {rejected} invalid rows" if rejected else ""
+            self.status_var.set(f"Imported {imported} entries{skipped}")
 
-        self.status_var.set(f"Exported CSV to {path}")
+        self._start_transfer("Importing", work, on_done, "Could not import file")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+import os
+import sys
+
+from storage import migrate_json_to_sqlite
+from tracker_core import APP_DIR, DATA_FILE, DB_FILE, REMINDERS_FILE
+
+# One-shot migration from data.json/reminders.json to symptoms.db.
+# After it runs, main.py picks up the database automatically.
+
+
+def main():
+    db_path = os.path.join(APP_DIR, DB_FILE)
+    if os.path.exists(db_path):
+        print(f"{db_path} already exists; remove it first to migrate again.")
+        sys.exit(1)
+    entries, reminders = migrate_json_to_sqlite(
+        os.path.join(APP_DIR, DATA_FILE),
+        os.path.join(APP_DIR, REMINDERS_FILE),
+        db_path,
+    )
+    print(f"Migrated {entries} entries and {reminders} reminders to {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Non-modal reminder notifications.
+#
+# notify() only queues the message and returns. Messages arriving within
+# COALESCE_MS of each other are shown together in one small always-on-top
+# toast in the bottom-right corner; if a toast is already open, new messages
+# are appended to it. Nothing here grabs input or runs a nested event loop,
+# so the scheduler keeps running while a notification is on screen.
+
+COALESCE_MS = 250
+TOAST_MS = 20000
+MAX_LINES = 8
+
+
+class NotificationCenter:
+    def __init__(self, root, title, sound=None):
+        self.root = root
+        self.title = title
+        self.sound = sound
+        self._pending = []
+        self._shown = []
+        self._flush_id = None
+        self._hide_id = None
+        self._toast = None
+        self._body = None
+
+    def notify(self, message):
+        self._pending.append(message)
+        if self._flush_id is None:
+            self._flush_id = self.root.after(COALESCE_MS, self._flush)
+
+    def _flush(self):
+        self._flush_id = None
+        if not self._pending:
+            return
+        self._shown.extend(self._pending)
+        self._pending = []
+        if self._toast is None:
+            self._build_toast()
+        self._render()
+        if self.sound:
+            self.sound()
+        # Each new batch restarts the auto-dismiss timer.
+        if self._hide_id is not None:
+            self.root.after_cancel(self._hide_id)
+        self._hide_id = self.root.after(TOAST_MS, self.dismiss)
+
+    def _build_toast(self):
+        toast = tk.Toplevel(self.root)
+        toast.title(self.title)
+        toast.resizable(False, False)
+        toast.attributes("-topmost", True)
+        toast.protocol("WM_DELETE_WINDOW", self.dismiss)
+
+        frame = ttk.Frame(toast, padding=12)
+        frame.grid(row=0, column=0, sticky="nsew")
+        self._body = ttk.Label(frame, justify="left", wraplength=320)
+        self._body.grid(row=0, column=0, sticky="w")
+        ttk.Button(frame, text="Dismiss", command=self.dismiss).grid(row=1, column=0, sticky="e", pady=(8, 0))
+        self._toast = toast
+
+    def _render(self):
+        lines = self._shown[-MAX_LINES:]
+        hidden = len(self._shown) - len(lines)
+        header = "Reminder" if len(self._shown) == 1 else f"{len(self._shown)} reminders"
+        text = "\n".join([header] + [f"- {line}" for line in lines])
+        if hidden:
+            text += f"\n(+{hidden} earlier)"
+        self._body.configure(text=text)
+
+        toast = self._toast
+        toast.update_idletasks()
+        x = toast.winfo_screenwidth() - toast.winfo_reqwidth() - 24
+        y = toast.winfo_screenheight() - toast.winfo_reqheight() - 72
+        toast.geometry(f"+{x}+{y}")
+        toast.deiconify()
+
+    def dismiss(self):
+        if self._hide_id is not None:
+            self.root.after_cancel(self._hide_id)
+            self._hide_id = None
+        if self._toast is not None:
+            self._toast.destroy()
+        self._toast = None
+        self._body = None
+        self._shown = []
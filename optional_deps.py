@@ -0,0 +1,13 @@
+# Optional third-party dependencies.
+#
+# NumPy is only needed for analytics and .npz files, so modules that use it
+# import it through require_numpy() the first time it is needed rather than
+# at import time; the app still starts and works without it.
+
+
+def require_numpy(purpose):
+    try:
+        import numpy
+    except Exception:
+        raise RuntimeError(f"NumPy is required for {purpose} (pip install numpy).")
+    return numpy
@@ -0,0 +1,169 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Timing spans around the app's hot paths (load, save, filter, table refresh,
+# reminder checks, import/export).
+#
+# Spans are off by default. While off, span() returns a shared no-op context
+# manager and begin()/end() return immediately, so instrumented code pays one
+# attribute check. While on, every span updates per-name stats (count, last,
+# mean, max) for the debug panel and status bar; with tracing also on, each
+# span is kept as a Chrome trace event that dump_trace() writes out for
+# chrome://tracing or Perfetto. A cProfile profiler can run alongside and is
+# dumped as a .prof file for pstats/snakeviz (it only sees the Tk thread).
+#
+# SYMPTOM_TRACKER_TRACE=<file> or SYMPTOM_TRACKER_PROFILE=<file> turn these on
+# from startup; the files are written when the app quits.
+
+TRACE_ENV = "SYMPTOM_TRACKER_TRACE"
+PROFILE_ENV = "SYMPTOM_TRACKER_PROFILE"
+MAX_TRACE_EVENTS = 100000
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "started")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, self.started, time.perf_counter())
+        return False
+
+
+class SpanStats:
+    __slots__ = ("count", "last_ms", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SpanRecorder:
+    def __init__(self):
+        self.enabled = False
+        self.tracing = False
+        self.stats = {}
+        self.last = None
+        self.events = deque(maxlen=MAX_TRACE_EVENTS)
+        self.trace_path = os.environ.get(TRACE_ENV) or None
+        self.profile_path = os.environ.get(PROFILE_ENV) or None
+        self._profiler = None
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        if self.trace_path:
+            self.enabled = self.tracing = True
+        if self.profile_path:
+            self.enabled = True
+            self.start_profile()
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def begin(self):
+        # For spans that end in a later callback: pass the token to end().
+        return time.perf_counter() if self.enabled else None
+
+    def end(self, name, token):
+        if token is not None and self.enabled:
+            self.record(name, token, time.perf_counter())
+
+    def record(self, name, started, finished):
+        elapsed_ms = (finished - started) * 1000
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = SpanStats()
+            stats.count += 1
+            stats.last_ms = elapsed_ms
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            self.last = (name, elapsed_ms)
+            if self.tracing:
+                self.events.append((name, started, finished, threading.get_ident()))
+
+    def snapshot(self):
+        with self._lock:
+            return sorted(
+                ((name, stats.count, stats.last_ms, stats.mean_ms, stats.max_ms) for name, stats in self.stats.items()),
+                key=lambda row: row[0],
+            )
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.events.clear()
+            self.last = None
+
+    def dump_trace(self, path):
+        with self._lock:
+            events = list(self.events)
+        trace = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (started - self._origin) * 1e6,
+                "dur": (finished - started) * 1e6,
+                "pid": os.getpid(),
+                "tid": thread_id,
+            }
+            for name, started, finished, thread_id in events
+        ]
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, handle)
+        return len(trace)
+
+    @property
+    def profiling(self):
+        return self._profiler is not None
+
+    def start_profile(self):
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path):
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return False
+        profiler.disable()
+        profiler.dump_stats(path)
+        return True
+
+    def flush(self):
+        # Writes the files requested through the environment; called on quit.
+        if self.profile_path:
+            self.stop_profile(self.profile_path)
+        if self.trace_path:
+            self.dump_trace(self.trace_path)
+
+
+spans = SpanRecorder()
@@ -0,0 +1,87 @@
+import heapq
+from datetime import datetime, timedelta
+
+from entry_record import DATE_FMT, TIME_FMT
+
+# Next-fire-time scheduler for daily reminders.
+#
+# Each reminder sits in a min-heap keyed by its next occurrence, so the app
+# can sleep until exactly that moment instead of polling. An occurrence that
+# was missed (machine asleep, clock moved forward) still fires if it is at
+# most MISSED_GRACE late; older ones are skipped. The same grace applies when
+# the schedule is built at startup, but a reminder added later starts from its
+# next occurrence, so one added at 09:05 for 09:00 waits until tomorrow. last_fired maps reminder id
+# to the date of its last fired occurrence and is persisted by the caller, so
+# a restart never fires the same occurrence twice. Removed or edited
+# reminders leave stale heap items behind, which are dropped when popped.
+
+MISSED_GRACE = timedelta(minutes=15)
+# Wake at least this often so wall-clock jumps are noticed promptly.
+MAX_SLEEP_SECONDS = 300
+
+
+def _occurrence_on(day, time_value):
+    return datetime.combine(day, datetime.strptime(time_value, TIME_FMT).time())
+
+
+class ReminderScheduler:
+    def __init__(self, reminders=(), last_fired=None, now=None):
+        self.last_fired = {} if last_fired is None else last_fired
+        self._active = {}
+        self._heap = []
+        self._seq = 0
+        now = now or datetime.now()
+        for reminder in reminders:
+            self.add(reminder, now, grace=MISSED_GRACE)
+
+    def add(self, reminder, now=None, grace=timedelta(0)):
+        now = now or datetime.now()
+        reminder_id = reminder.get("id")
+        self._active[reminder_id] = reminder
+        earliest = now - grace
+        when = _occurrence_on(earliest.date(), reminder["time"])
+        if when < earliest:
+            when += timedelta(days=1)
+        if self.last_fired.get(reminder_id) == when.strftime(DATE_FMT):
+            when = _occurrence_on(when.date() + timedelta(days=1), reminder["time"])
+        self._push(when, reminder)
+
+    def remove(self, reminder_id):
+        self._active.pop(reminder_id, None)
+        self.last_fired.pop(reminder_id, None)
+
+    def _push(self, when, reminder):
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, reminder.get("id"), reminder.get("time")))
+
+    def _is_current(self, reminder_id, time_value):
+        reminder = self._active.get(reminder_id)
+        return reminder is not None and reminder.get("time") == time_value
+
+    def next_fire_time(self):
+        while self._heap and not self._is_current(self._heap[0][2], self._heap[0][3]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def next_delay(self, now=None):
+        # Seconds to sleep before calling due() again.
+        now = now or datetime.now()
+        when = self.next_fire_time()
+        if when is None:
+            return MAX_SLEEP_SECONDS
+        return min(max((when - now).total_seconds(), 0.0), MAX_SLEEP_SECONDS)
+
+    def due(self, now=None):
+        now = now or datetime.now()
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _seq, reminder_id, time_value = heapq.heappop(self._heap)
+            if not self._is_current(reminder_id, time_value):
+                continue
+            reminder = self._active[reminder_id]
+            fire_date = when.strftime(DATE_FMT)
+            if now - when <= MISSED_GRACE and self.last_fired.get(reminder_id) != fire_date:
+                self.last_fired[reminder_id] = fire_date
+                fired.append(reminder)
+            self._push(_occurrence_on(when.date() + timedelta(days=1), time_value), reminder)
+        return fired
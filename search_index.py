@@ -0,0 +1,135 @@
+import re
+from array import array
+
+# In-memory inverted index for the search box.
+#
+# Every entry's searchable text (symptom, triggers, notes) is broken into word
+# tokens once, when the entry is added, and each token keeps a posting list of
+# the entries that contain it. Trigrams are kept for the vocabulary only, so
+# adding an entry costs one set of tokens rather than one posting per trigram
+# of its text. A query is matched through its longest run of word characters:
+# any entry containing the query has that run inside one of its tokens, so the
+# trigrams find the tokens, their postings give the candidates, and only those
+# are re-checked. The work per keystroke depends on the vocabulary and the
+# number of matches, not on the total amount of text.
+
+NGRAM = 3
+TOKEN_RE = re.compile(r"\w+")
+# How many candidates to examine between checks of a query's cancel flag.
+CANCEL_CHECK_EVERY = 4096
+
+
+class QueryCancelled(Exception):
+    pass
+
+
+def check_cancelled(cancelled, step):
+    if cancelled and step % CANCEL_CHECK_EVERY == 0 and cancelled():
+        raise QueryCancelled()
+
+
+def entry_text(entry):
+    return " ".join(
+        [
+            entry.get("symptom", ""),
+            entry.get("triggers", ""),
+            entry.get("notes", ""),
+        ]
+    ).lower()
+
+
+def _grams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class SearchIndex:
+    def __init__(self, entries=()):
+        self._docs = {}
+        self._by_entry_id = {}
+        self._tokens = {}
+        self._grams = {}
+        self._next_doc = 0
+        self._dead = 0
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, entry):
+        # Doc numbers grow with insertion order, so sorting matches restores list order.
+        doc = self._next_doc
+        self._next_doc += 1
+        self._docs[doc] = entry
+        self._by_entry_id.setdefault(entry.get("id"), []).append(doc)
+
+        for token in set(TOKEN_RE.findall(entry_text(entry))):
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = array("i")
+                for gram in _grams(token):
+                    self._grams.setdefault(gram, []).append(token)
+            postings.append(doc)
+
+    def remove_ids(self, ids):
+        for entry_id in ids:
+            for doc in self._by_entry_id.pop(entry_id, ()):
+                del self._docs[doc]
+                self._dead += 1
+        # Posting lists drop removed docs lazily; rebuild once they are mostly garbage.
+        if self._dead > max(len(self._docs), 1024):
+            self._rebuild()
+
+    def _rebuild(self):
+        entries = [self._docs[doc] for doc in sorted(self._docs)]
+        self.__init__(entries)
+
+    def _tokens_containing(self, word, cancelled):
+        if len(word) < NGRAM:
+            # A short fragment: scanning the vocabulary is cheap enough.
+            tokens = self._tokens
+        else:
+            postings = []
+            for gram in _grams(word):
+                found = self._grams.get(gram)
+                if found is None:
+                    return []
+                postings.append(found)
+            postings.sort(key=len)
+            tokens = set(postings[0])
+            for found in postings[1:]:
+                tokens.intersection_update(found)
+        matched = []
+        for step, token in enumerate(tokens):
+            check_cancelled(cancelled, step)
+            if word in token:
+                matched.append(token)
+        return matched
+
+    def search(self, query, cancelled=None):
+        query = query.strip().lower()
+        if not query:
+            return [self._docs[doc] for doc in sorted(self._docs)]
+
+        words = TOKEN_RE.findall(query)
+        if words:
+            word = max(words, key=len)
+            candidates = set()
+            for token in self._tokens_containing(word, cancelled):
+                candidates.update(self._tokens[token])
+            # A query that is a single word fragment matches every entry found through it.
+            verify = word != query
+        else:
+            candidates = self._docs.keys()
+            verify = True
+
+        results = []
+        for step, doc in enumerate(sorted(candidates)):
+            check_cancelled(cancelled, step)
+            entry = self._docs.get(doc)
+            if entry is None:
+                continue
+            if verify and query not in entry_text(entry):
+                continue
+            results.append(entry)
+        return results
@@ -0,0 +1,523 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import date
+
+from entry_record import Entry, date_ordinal
+from perf_trace import spans
+from write_behind import WriteBehind
+
+# Storage backends for symptom entries and reminders.
+#
+# JsonStorage rewrites the whole list on every save (the original behaviour).
+# JournalStorage keeps the same data.json snapshot but appends each add/delete
+# as one JSON line to a journal file, so a single edit costs O(1) disk work.
+# Once the journal grows past a threshold it is folded back into the snapshot
+# on a background thread.
+# Every JSON file is replaced atomically (temp file, fsync, rename), so a crash
+# leaves either the old or the new version on disk, never a torn one. Journal
+# appends and reminder saves go through a WriteBehind queue: a burst of edits
+# becomes one deferred write, and close() flushes whatever is still pending.
+# A snapshot that fails to parse is moved aside rather than overwritten.
+# SqliteStorage keeps everything in one database with indexes on date and
+# symptom and a trigram full-text table over "symptom triggers notes" (the
+# same joined text EntryStore searches), so filters can run as indexed queries.
+
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".compacting"
+COMPACT_THRESHOLD_BYTES = 256 * 1024
+# The journal may also grow to this fraction of the snapshot before compacting,
+# so the cost of rewriting a large snapshot stays amortized over many appends.
+COMPACT_RATIO = 0.5
+REMINDER_STATE_SUFFIX = "_fired.json"
+DAMAGED_SUFFIX = ".damaged"
+ENTRY_FIELDS = ("id", "date", "symptom", "severity", "duration", "triggers", "notes")
+REMINDER_FIELDS = ("id", "time", "message")
+
+
+def _read_snapshot(path, default=None):
+    if not os.path.exists(path):
+        return [] if default is None else default
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except ValueError as exc:
+        # Keep the damaged file so a fresh start can't overwrite what's left of it.
+        damaged_path = _set_aside(path)
+        raise ValueError(f"{os.path.basename(path)} is damaged ({exc}); it was kept as {damaged_path}") from exc
+
+
+def _set_aside(path):
+    # Renames path to path.damaged (or .damaged.1, ...) without replacing an earlier one.
+    damaged_path = path + DAMAGED_SUFFIX
+    number = 0
+    while os.path.exists(damaged_path):
+        number += 1
+        damaged_path = f"{path}{DAMAGED_SUFFIX}.{number}"
+    os.replace(path, damaged_path)
+    return damaged_path
+
+
+def _fsync_dir(path):
+    # Makes the rename itself durable; not supported (or needed) on Windows.
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_json(path, data):
+    with spans.span("save.file"):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(path)
+
+
+def _write_snapshot(path, entries):
+    _atomic_write_json(path, [dict(entry) for entry in entries])
+
+
+def _entry_key(entry):
+    return json.dumps(entry, sort_keys=True)
+
+
+def _replay(entries, path, dedupe=False):
+    if not os.path.exists(path):
+        return entries
+    # Only a journal left over from an interrupted compaction can overlap the snapshot.
+    seen = {_entry_key(entry) for entry in entries} if dedupe else None
+
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line torn by a crash mid-append; the records around it are intact.
+                continue
+            op = record.get("op")
+            if op in ("add", "add_many"):
+                added = record.get("entries", []) if op == "add_many" else [record.get("entry", {})]
+                for entry in added:
+                    if seen is not None and _entry_key(entry) in seen:
+                        continue
+                    entries.append(entry)
+            elif op == "delete":
+                ids = set(record.get("ids", []))
+                if ids:
+                    entries = [entry for entry in entries if entry.get("id") not in ids]
+    return entries
+
+
+def _end_torn_line(path):
+    # A crash mid-append can leave the journal without its final newline; start
+    # a fresh line so the next record isn't glued onto the torn fragment.
+    try:
+        with open(path, "rb+") as handle:
+            handle.seek(0, os.SEEK_END)
+            if handle.tell() == 0:
+                return
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                handle.write(b"\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+    except FileNotFoundError:
+        pass
+
+
+class Storage(ABC):
+    # Backends that can answer filters themselves set this and add
+    # query(text="", from_date=None, to_date=None); callers check it first.
+    supports_query = False
+
+    def __init__(self, path, reminders_path=None):
+        self.path = path
+        self.reminders_path = reminders_path
+        self.writer = WriteBehind()
+
+    @abstractmethod
+    def load(self):
+        ...
+
+    @abstractmethod
+    def save(self, entries):
+        ...
+
+    @abstractmethod
+    def append(self, entry, entries):
+        ...
+
+    def append_many(self, added, entries):
+        for entry in added:
+            self.append(entry, entries)
+
+    @abstractmethod
+    def delete(self, ids, entries):
+        ...
+
+    def load_reminders(self):
+        if not self.reminders_path:
+            return []
+        self.writer.flush()
+        return _read_snapshot(self.reminders_path)
+
+    def save_reminders(self, reminders):
+        snapshot = [dict(reminder) for reminder in reminders]
+        self.writer.schedule("reminders", lambda: _atomic_write_json(self.reminders_path, snapshot))
+
+    def _reminder_state_path(self):
+        if not self.reminders_path:
+            return None
+        return os.path.splitext(self.reminders_path)[0] + REMINDER_STATE_SUFFIX
+
+    def load_reminder_state(self):
+        path = self._reminder_state_path()
+        if not path:
+            return {}
+        self.writer.flush()
+        return _read_snapshot(path, default={})
+
+    def save_reminder_state(self, state):
+        snapshot = dict(state)
+        self.writer.schedule("reminder_state", lambda: _atomic_write_json(self._reminder_state_path(), snapshot))
+
+    def flush(self):
+        # Writes whatever is still queued on the calling thread.
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+
+class JsonStorage(Storage):
+    def load(self):
+        self.writer.flush()
+        return _read_snapshot(self.path)
+
+    def save(self, entries):
+        snapshot = list(entries)
+        self.writer.schedule("entries", lambda: _write_snapshot(self.path, snapshot))
+
+    def append(self, entry, entries):
+        self.save(entries)
+
+    def append_many(self, added, entries):
+        self.save(entries)
+
+    def delete(self, ids, entries):
+        self.save(entries)
+
+
+class JournalStorage(Storage):
+    def __init__(self, path, reminders_path=None, compact_threshold=COMPACT_THRESHOLD_BYTES):
+        super().__init__(path, reminders_path)
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compacting_path = path + COMPACTING_SUFFIX
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._compactor = None
+        self._buffer = []
+
+    def load(self):
+        self.writer.flush()
+        self._wait_for_compaction()
+        try:
+            entries = _read_snapshot(self.path)
+        except ValueError:
+            # The journals only make sense on top of the lost snapshot, and the
+            # next compaction would fold them into an empty one; keep them with it.
+            for path in (self.compacting_path, self.journal_path):
+                if os.path.exists(path):
+                    _set_aside(path)
+            raise
+        # An interrupted compaction leaves its journal behind; it predates the live one.
+        entries = _replay(entries, self.compacting_path, dedupe=True)
+        entries = _replay(entries, self.journal_path)
+        _end_torn_line(self.journal_path)
+        if os.path.exists(self.compacting_path):
+            self.save(entries)
+        return entries
+
+    def save(self, entries):
+        self._wait_for_compaction()
+        with self._lock:
+            # The snapshot already holds whatever the buffered journal lines describe.
+            self._buffer = []
+            _write_snapshot(self.path, entries)
+            for stale in (self.compacting_path, self.journal_path):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    def append(self, entry, entries):
+        self._write_record({"op": "add", "entry": dict(entry)})
+        self._maybe_compact(entries)
+
+    def append_many(self, added, entries):
+        # One record per batch keeps bulk imports to a single write each.
+        self._write_record({"op": "add_many", "entries": [dict(entry) for entry in added]})
+        self._maybe_compact(entries)
+
+    def delete(self, ids, entries):
+        self._write_record({"op": "delete", "ids": sorted(ids)})
+        self._maybe_compact(entries)
+
+    def close(self):
+        super().close()
+        self._wait_for_compaction()
+
+    def _write_record(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+        self.writer.schedule("journal", self._flush_journal)
+
+    def _flush_journal(self):
+        with self._lock:
+            self._append_buffer()
+
+    def _append_buffer(self):
+        # Caller holds self._lock. One append and one fsync for every buffered record.
+        if not self._buffer:
+            return
+        with spans.span("save.journal"), open(self.journal_path, "a", encoding="utf-8") as handle:
+            handle.write("".join(self._buffer))
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._buffer = []
+
+    def _size(self, path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _maybe_compact(self, entries):
+        limit = max(self.compact_threshold, self._size(self.path) * COMPACT_RATIO)
+        if self._size(self.journal_path) < limit:
+            return
+        if self._compactor and self._compactor.is_alive():
+            return
+        with self._lock:
+            # Later appends go to a fresh journal while the old one is folded
+            # into the snapshot; both are cut at the same point.
+            self._append_buffer()
+            os.replace(self.journal_path, self.compacting_path)
+            snapshot = list(entries)
+        self._compactor = threading.Thread(target=self._compact, args=(snapshot,), daemon=True)
+        self._compactor.start()
+
+    def _compact(self, snapshot):
+        with spans.span("save.compact"):
+            _write_snapshot(self.path, snapshot)
+        try:
+            os.remove(self.compacting_path)
+        except OSError:
+            pass
+
+    def _wait_for_compaction(self):
+        if self._compactor:
+            self._compactor.join()
+            self._compactor = None
+
+
+class SqliteStorage(Storage):
+    supports_query = True
+
+    def __init__(self, path):
+        super().__init__(path)
+        # Filters may be evaluated off the Tk thread; all access goes through the lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Dates are ordered and filtered exactly as EntryStore does it: by
+        # ordinal, with dates that don't parse (ordinal 0) first and in every range.
+        self._conn.create_function("date_ordinal", 1, date_ordinal, deterministic=True)
+        # SQLite's lower() only folds ASCII; the store lowercases with Python.
+        self._conn.create_function("lower_text", 1, str.lower, deterministic=True)
+        self._lock = threading.Lock()
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            has_text_index = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'entries_text'"
+            ).fetchone()
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    rowid INTEGER PRIMARY KEY,
+                    id TEXT,
+                    date TEXT,
+                    symptom TEXT,
+                    severity TEXT,
+                    duration TEXT,
+                    triggers TEXT,
+                    notes TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_id ON entries(id);
+                CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date);
+                CREATE INDEX IF NOT EXISTS idx_entries_symptom ON entries(symptom);
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_text USING fts5(
+                    body, content='', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS entries_text_ai AFTER INSERT ON entries BEGIN
+                    INSERT INTO entries_text(rowid, body)
+                    VALUES (new.rowid, new.symptom || ' ' || new.triggers || ' ' || new.notes);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_text_ad AFTER DELETE ON entries BEGIN
+                    INSERT INTO entries_text(entries_text, rowid, body)
+                    VALUES ('delete', old.rowid, old.symptom || ' ' || old.triggers || ' ' || old.notes);
+                END;
+                CREATE TABLE IF NOT EXISTS reminders (
+                    rowid INTEGER PRIMARY KEY,
+                    id TEXT,
+                    time TEXT,
+                    message TEXT
+                );
+                CREATE TABLE IF NOT EXISTS reminder_state (
+                    id TEXT PRIMARY KEY,
+                    last_fired TEXT
+                );
+                """
+            )
+            if not has_text_index:
+                # Databases from before the combined text index searched each field on its own.
+                self._conn.executescript(
+                    """
+                    DROP TRIGGER IF EXISTS entries_ai;
+                    DROP TRIGGER IF EXISTS entries_ad;
+                    DROP TABLE IF EXISTS entries_fts;
+                    INSERT INTO entries_text(rowid, body)
+                        SELECT rowid, symptom || ' ' || triggers || ' ' || notes FROM entries;
+                    """
+                )
+
+    def _rows_to_entries(self, rows):
+        return [Entry(*row) for row in rows]
+
+    def _insert_entries(self, entries):
+        self._conn.executemany(
+            "INSERT INTO entries (id, date, symptom, severity, duration, triggers, notes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [tuple(entry.get(field, "") for field in ENTRY_FIELDS) for entry in entries],
+        )
+
+    def load(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, date, symptom, severity, duration, triggers, notes FROM entries ORDER BY rowid"
+            ).fetchall()
+        return self._rows_to_entries(rows)
+
+    def save(self, entries):
+        with spans.span("save.sqlite"), self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._insert_entries(entries)
+
+    def append(self, entry, entries):
+        with spans.span("save.sqlite"), self._lock, self._conn:
+            self._insert_entries([entry])
+
+    def append_many(self, added, entries):
+        with spans.span("save.sqlite"), self._lock, self._conn:
+            self._insert_entries(added)
+
+    def delete(self, ids, entries):
+        ids = list(ids)
+        if not ids:
+            return
+        placeholders = ",".join("?" for _ in ids)
+        with spans.span("save.sqlite"), self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM entries WHERE id IN ({placeholders})", ids)
+
+    def query(self, text="", from_date=None, to_date=None):
+        clauses = []
+        params = []
+        if from_date or to_date:
+            clauses.append("(date_ordinal(e.date) = 0 OR date_ordinal(e.date) BETWEEN ? AND ?)")
+            params.append(date_ordinal(from_date) if from_date else 1)
+            params.append(date_ordinal(to_date) if to_date else date.max.toordinal())
+
+        # Both paths search "symptom triggers notes" as one text, like EntryStore.
+        text = text.strip().lower()
+        joins = ""
+        if len(text) >= 3:
+            # Trigram tokens give case-insensitive substring matching straight from the index.
+            joins = "JOIN entries_text f ON f.rowid = e.rowid"
+            clauses.append("entries_text MATCH ?")
+            params.append('"' + text.replace('"', '""') + '"')
+        elif text:
+            # Too short for a trigram; fall back to a scan of the (already date-narrowed) rows.
+            clauses.append("instr(lower_text(e.symptom || ' ' || e.triggers || ' ' || e.notes), ?) > 0")
+            params.append(text)
+
+        sql = "SELECT e.id, e.date, e.symptom, e.severity, e.duration, e.triggers, e.notes FROM entries e " + joins
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        # Rows are inserted in store order, so rowid breaks ties like the store's sequence.
+        sql += " ORDER BY date_ordinal(e.date), e.rowid"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return self._rows_to_entries(rows)
+
+    def load_reminders(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT id, time, message FROM reminders ORDER BY rowid").fetchall()
+        return [dict(zip(REMINDER_FIELDS, row)) for row in rows]
+
+    def save_reminders(self, reminders):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reminders")
+            self._conn.executemany(
+                "INSERT INTO reminders (id, time, message) VALUES (?, ?, ?)",
+                [tuple(reminder.get(field, "") for field in REMINDER_FIELDS) for reminder in reminders],
+            )
+
+    def load_reminder_state(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT id, last_fired FROM reminder_state").fetchall())
+
+    def save_reminder_state(self, state):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reminder_state")
+            self._conn.executemany("INSERT INTO reminder_state (id, last_fired) VALUES (?, ?)", list(state.items()))
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._conn.close()
+
+
+def open_storage(data_path, reminders_path, db_path):
+    # Once a database has been migrated it becomes the source of truth.
+    if os.path.exists(db_path):
+        return SqliteStorage(db_path)
+    return JournalStorage(data_path, reminders_path)
+
+
+def migrate_json_to_sqlite(data_path, reminders_path, db_path):
+    source = JournalStorage(data_path, reminders_path)
+    entries = source.load()
+    reminders = source.load_reminders()
+    reminder_state = source.load_reminder_state()
+    source.close()
+    target = SqliteStorage(db_path)
+    try:
+        target.save(entries)
+        target.save_reminders(reminders)
+        target.save_reminder_state(reminder_state)
+    finally:
+        target.close()
+    return len(entries), len(reminders)
@@ -0,0 +1,130 @@
+# Virtualized view over a ttk.Treeview.
+#
+# The Treeview only ever holds a window of WINDOW_SIZE consecutive rows; the
+# full row list stays in Python. The scrollbar is driven by this class rather
+# than by the Treeview, so its thumb and drags map onto the whole list: a drag
+# to 40% rebuilds the window around the row 40% of the way down. Scrolling
+# inside the window (wheel, keys, arrows) is left to the Treeview, and once the
+# visible rows come within MARGIN rows of either end of the window it is moved
+# to centre them again. Adds and deletes are applied as diffs (one insert, or
+# deletes of just the affected items) so the table is never torn down and
+# rebuilt for a single change.
+
+WINDOW_SIZE = 300
+# Rows kept between the visible ones and the window's edge before the window moves.
+MARGIN = 60
+
+
+class VirtualTable:
+    def __init__(self, tree, scrollbar, columns, window_size=WINDOW_SIZE):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.columns = columns
+        self.window_size = window_size
+        self.rows = []
+        # The Treeview holds rows[top:top + shown].
+        self.top = 0
+        self.shown = 0
+        self._move_pending = False
+        tree.configure(yscrollcommand=self._on_tree_scroll)
+        if scrollbar is not None:
+            scrollbar.configure(command=self._on_scrollbar)
+
+    def _values(self, entry):
+        return tuple(entry.get(column, "") for column in self.columns)
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self._show(0, 0)
+
+    def _show(self, top, first_row):
+        # Rebuilds the window at rows[top:] and scrolls first_row to the top of the view.
+        selected = set(self.tree.selection())
+        self.tree.delete(*self.tree.get_children())
+        window = self.rows[top:top + self.window_size]
+        for entry in window:
+            self.tree.insert("", "end", iid=entry.get("id"), values=self._values(entry))
+        self.top = top
+        self.shown = len(window)
+        # Selection survives a move for the rows that are still in the window.
+        kept = [entry.get("id") for entry in window if entry.get("id") in selected]
+        if kept:
+            self.tree.selection_set(kept)
+        if self.shown:
+            self.tree.yview_moveto((first_row - top) / self.shown)
+
+    def scroll_to(self, row):
+        # Moves the window so rows[row] is near its middle and shows it at the top.
+        row = max(0, min(row, len(self.rows) - 1))
+        top = max(0, min(row - self.window_size // 2, len(self.rows) - self.window_size))
+        self._show(top, row)
+
+    def _on_scrollbar(self, *args):
+        if args[0] != "moveto" or not self.rows:
+            self.tree.yview(*args)
+            return
+        row = int(float(args[1]) * len(self.rows))
+        if self.top <= row < self.top + self.shown:
+            self.tree.yview_moveto((row - self.top) / self.shown)
+        else:
+            self.scroll_to(row)
+
+    def _on_tree_scroll(self, first, last):
+        # first and last are fractions of the window; report them as fractions of all rows.
+        total = len(self.rows)
+        if not total or not self.shown:
+            if self.scrollbar is not None:
+                self.scrollbar.set(0.0, 1.0)
+            return
+        first_row = self.top + float(first) * self.shown
+        last_row = self.top + float(last) * self.shown
+        if self.scrollbar is not None:
+            self.scrollbar.set(first_row / total, last_row / total)
+        if self._move_pending:
+            return
+        near_top = self.top > 0 and first_row - self.top < MARGIN
+        near_bottom = self.top + self.shown < total and self.top + self.shown - last_row < MARGIN
+        if near_top or near_bottom:
+            self._move_pending = True
+            self.tree.after_idle(self._recentre)
+
+    def _recentre(self):
+        self._move_pending = False
+        if self.shown:
+            self.scroll_to(self.top + round(float(self.tree.yview()[0]) * self.shown))
+
+    def insert(self, pos, entry):
+        self.rows.insert(pos, entry)
+        if pos < self.top:
+            self.top += 1
+            return
+        if pos - self.top > self.shown or (pos - self.top == self.shown and self.shown >= self.window_size):
+            return
+        self.tree.insert("", pos - self.top, iid=entry.get("id"), values=self._values(entry))
+        self.shown += 1
+        if self.shown > self.window_size:
+            # Keep the window bounded: the row pushed off its end leaves the Treeview.
+            self.shown -= 1
+            self.tree.delete(self.rows[self.top + self.shown].get("id"))
+
+    def remove_ids(self, ids):
+        kept = []
+        removed_above = 0
+        removed_shown = 0
+        end = self.top + self.shown
+        for pos, entry in enumerate(self.rows):
+            if entry.get("id") not in ids:
+                kept.append(entry)
+            elif pos < self.top:
+                removed_above += 1
+            elif pos < end:
+                removed_shown += 1
+                if self.tree.exists(entry.get("id")):
+                    self.tree.delete(entry.get("id"))
+        self.rows[:] = kept
+        self.top -= removed_above
+        self.shown -= removed_shown
+        # Top the window back up from the rows below it.
+        for entry in self.rows[self.top + self.shown:self.top + self.window_size]:
+            self.tree.insert("", "end", iid=entry.get("id"), values=self._values(entry))
+            self.shown += 1
@@ -0,0 +1,76 @@
+import pytest
+
+from analytics import SymptomAnalytics, format_report
+
+np = pytest.importorskip("numpy")
+
+
+def entry(day, symptom, severity, triggers=""):
+    return {"id": f"{symptom}-{day}", "date": f"2024-01-{day:02d}", "symptom": symptom,
+            "severity": severity, "duration": "", "triggers": triggers, "notes": ""}
+
+
+ENTRIES = [
+    entry(1, "Headache", 4, "coffee, stress"),
+    entry(1, "Nausea", 2),
+    entry(3, "Headache", 6, "coffee"),
+    entry(8, "Headache", 8, "Coffee"),
+    entry(9, "Fatigue", "", "stress"),
+    entry(10, "Fatigue", 2, "stress"),
+    entry(10, "Nausea", 1, "stress"),
+]
+
+
+def test_results_summarise_counts_days_weeks_and_weekdays():
+    results = SymptomAnalytics(ENTRIES).results()
+
+    assert results["symptom_counts"] == [("Headache", 3), ("Nausea", 2), ("Fatigue", 2)]
+
+    daily = results["daily"]
+    assert len(daily["dates"]) == 10 and str(daily["dates"][0]) == "2024-01-01"
+    assert daily["mean"][0] == 3 and daily["mean"][2] == 6 and np.isnan(daily["mean"][1])
+    # The 7-day window ending on Jan 8 covers Jan 2-8: severities 6 and 8.
+    assert daily["rolling"][7] == 7
+
+    weekly = results["weekly"]
+    assert [str(week) for week in weekly["weeks"]] == ["2024-01-01", "2024-01-08"]
+    assert weekly["mean"].tolist() == [4, pytest.approx(11 / 3)]
+
+    heatmap = results["heatmap"]
+    assert heatmap["symptoms"] == ["Headache", "Nausea", "Fatigue"]
+    # 2024-01-01 is a Monday.
+    assert heatmap["counts"][0].tolist() == [2, 0, 1, 0, 0, 0, 0]
+    assert heatmap["severity"][0][0] == 6
+
+
+def test_trigger_correlation_uses_scored_entries_only():
+    triggers = SymptomAnalytics(ENTRIES).results()["triggers"]
+
+    assert triggers["triggers"] == ["coffee", "stress"]
+    assert triggers["count"].tolist() == [3, 3]
+    assert triggers["mean_severity"].tolist() == [6, pytest.approx(7 / 3)]
+    assert triggers["correlation"][0] > 0 > triggers["correlation"][1]
+
+
+def test_incremental_updates_match_a_rebuild():
+    analytics = SymptomAnalytics(ENTRIES[:3])
+    first = analytics.results()
+    analytics.add_many(ENTRIES[3:])
+    analytics.remove_many(ENTRIES[:2])
+    assert analytics.results() is not first
+
+    rebuilt = SymptomAnalytics(ENTRIES[2:]).results()
+    updated = analytics.results()
+    assert updated["symptom_counts"] == rebuilt["symptom_counts"]
+    np.testing.assert_array_equal(updated["daily"]["dates"], rebuilt["daily"]["dates"])
+    np.testing.assert_array_equal(updated["daily"]["rolling"], rebuilt["daily"]["rolling"])
+    np.testing.assert_array_equal(updated["heatmap"]["counts"], rebuilt["heatmap"]["counts"])
+    assert format_report(updated) == format_report(rebuilt)
+
+
+def test_empty_history_has_empty_results():
+    results = SymptomAnalytics().results()
+
+    assert results["symptom_counts"] == [] and len(results["daily"]["dates"]) == 0
+    assert results["triggers"]["triggers"] == []
+    assert format_report(results) == "Symptoms"
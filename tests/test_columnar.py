@@ -0,0 +1,54 @@
+import pytest
+
+from columnar import FORMAT_VERSION, read_npz, write_npz
+
+np = pytest.importorskip("numpy")
+
+
+def entry(entry_id, date, severity, notes=""):
+    return {"id": entry_id, "date": date, "symptom": "Headache", "severity": severity,
+            "duration": "2h", "triggers": "coffee, stress", "notes": notes}
+
+
+def test_round_trip_keeps_every_field(tmp_path):
+    path = str(tmp_path / "history.npz")
+    entries = [
+        entry("a", "2024-01-01", "3", "woke up with it"),
+        entry("b", "2024-02-29", "10", "ünïcode ✓"),
+        entry("c", "", "", ""),
+    ]
+
+    assert write_npz(path, entries) == 3
+    assert [dict(item) for item in read_npz(path)] == entries
+
+    with np.load(path) as archive:
+        assert archive["date"].dtype == np.dtype("datetime64[D]")
+        assert archive["severity"].dtype == np.int8
+        assert archive["symptom_vocab"].tolist() == ["Headache"]
+
+
+def test_unreadable_date_and_severity_load_as_blank(tmp_path):
+    path = str(tmp_path / "history.npz")
+    write_npz(path, [entry("a", "sometime", "bad")])
+
+    loaded = read_npz(path)[0]
+    assert loaded["date"] == "" and loaded["severity"] == ""
+
+
+def test_empty_history_round_trips(tmp_path):
+    path = str(tmp_path / "history.npz")
+
+    assert write_npz(path, []) == 0
+    assert read_npz(path) == []
+
+
+def test_newer_format_is_rejected(tmp_path):
+    path = str(tmp_path / "history.npz")
+    write_npz(path, [entry("a", "2024-01-01", "3")])
+    with np.load(path) as archive:
+        columns = dict(archive)
+    columns["format_version"] = np.array(FORMAT_VERSION + 1)
+    np.savez(path, **columns)
+
+    with pytest.raises(ValueError, match="Unsupported"):
+        read_npz(path)
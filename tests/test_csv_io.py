@@ -0,0 +1,44 @@
+import pytest
+
+from csv_io import CSV_FIELDS, TransferCancelled, read_csv_batches, write_csv_chunks
+
+
+def rows(count):
+    return [{"id": f"e{n}", "date": f"2024-01-{n % 28 + 1:02d}", "symptom": "Headache, mild",
+             "severity": str(n % 10 + 1), "duration": "1h", "triggers": "coffee",
+             "notes": "line one\nline \"two\""} for n in range(count)]
+
+
+def test_round_trip_in_chunks_and_batches(tmp_path):
+    path = str(tmp_path / "export.csv")
+    entries = rows(25)
+    written = []
+
+    assert write_csv_chunks(path, entries, chunk_size=10, progress=written.append) == 25
+    assert written == [0.4, 0.8, 1.0]
+
+    read = []
+    batches = list(read_csv_batches(path, batch_size=10, progress=read.append))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [row for batch in batches for row in batch] == [
+        {field: entry[field] for field in CSV_FIELDS} for entry in entries
+    ]
+    assert read[-1] == 1.0 and read == sorted(read)
+
+
+def test_reader_accepts_a_byte_order_mark(tmp_path):
+    path = tmp_path / "excel.csv"
+    path.write_bytes("\ufeffdate,symptom,severity\r\n2024-01-01,Nausea,2\r\n".encode("utf-8"))
+
+    assert list(read_csv_batches(str(path))) == [[{"date": "2024-01-01", "symptom": "Nausea", "severity": "2"}]]
+
+
+def test_cancel_stops_both_directions(tmp_path):
+    path = str(tmp_path / "export.csv")
+    with pytest.raises(TransferCancelled):
+        write_csv_chunks(path, rows(25), chunk_size=10, cancelled=lambda: True)
+
+    write_csv_chunks(path, rows(25))
+    batches = read_csv_batches(path, batch_size=10, cancelled=lambda: True)
+    with pytest.raises(TransferCancelled):
+        list(batches)
@@ -0,0 +1,15 @@
+from entry_ids import MonotonicIds, id_micros
+
+
+def test_advance_past_skips_missing_and_odd_ids():
+    ids = MonotonicIds()
+    ids.advance_past([None, "", 17, "2999-01-01T00:00:00", "zzz-custom"])
+
+    assert id_micros(ids.next()) == id_micros("2999-01-01T00:00:00.000001")
+
+
+def test_advance_past_without_usable_ids_leaves_the_counter():
+    ids = MonotonicIds()
+    ids.advance_past([None, "reminder-1"])
+
+    assert ids.next() < "2999"
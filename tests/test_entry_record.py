@@ -0,0 +1,14 @@
+from entry_record import Entry
+
+
+def row(severity):
+    return {"id": "1", "date": "2024-01-01", "symptom": "Headache", "severity": severity}
+
+
+def test_plain_digits_become_int():
+    assert Entry.from_dict(row("7")).severity == 7
+
+
+def test_non_decimal_digits_stay_text():
+    for value in ("²", "٣", "07", "mild"):
+        assert Entry.from_dict(row(value)).severity == value
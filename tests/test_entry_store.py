@@ -0,0 +1,52 @@
+import entry_store
+from entry_store import EntryStore
+from search_index import SearchIndex, entry_text
+
+
+def entry(entry_id, day, symptom, notes=""):
+    return {"id": entry_id, "date": f"2024-01-{day:02d}", "symptom": symptom, "severity": 3,
+            "duration": "", "triggers": "", "notes": notes}
+
+
+ENTRIES = [
+    entry("a", 1, "Headache", "after a long run"),
+    entry("b", 2, "Migraine", "light hurts, headache too"),
+    entry("c", 3, "Nausea", "ate late"),
+    entry("d", 4, "Back pain", "long drive!"),
+]
+
+
+def scan(store, text):
+    return [item for item in store.rows if text in entry_text(item)]
+
+
+def test_index_is_built_on_first_text_query():
+    store = EntryStore(ENTRIES)
+    assert store._index is None
+
+    store.add(entry("e", 5, "Headache"))
+    store.remove_ids(["c"])
+    assert store._index is None
+
+    for text in ["headache", "he", "long r", "ate", "e, h", "!", "zzz"]:
+        assert store.query(text) == scan(store, text)
+    assert store._index is not None
+
+
+def test_warm_index_catches_up_with_changes_made_while_building(monkeypatch):
+    store = EntryStore(ENTRIES)
+
+    def build_while_editing(entries):
+        index = SearchIndex(entries)
+        store.remove_ids(["a"])
+        store.add(entry("a", 6, "Dizzy", "headache later"))
+        store.add_many([entry("f", 7, "Headache")])
+        return index
+
+    monkeypatch.setattr(entry_store, "SearchIndex", build_while_editing)
+    store.warm_index()
+    monkeypatch.undo()
+
+    assert len(store.index) == len(store)
+    for text in ["headache", "dizzy", "long"]:
+        assert store.query(text) == scan(store, text)
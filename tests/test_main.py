@@ -0,0 +1,79 @@
+import types
+
+import main
+from storage import SqliteStorage
+from tracker_core import DB_FILE, Tracker, parse_filter
+
+
+class Var:
+    # Stands in for a tk.StringVar.
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Notes:
+    def __init__(self, text):
+        self.text = text
+
+    def get(self, start, end):
+        return self.text
+
+
+class IdleWorker:
+    busy = False
+
+    def cancel(self):
+        pass
+
+
+class Table:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def insert(self, pos, entry):
+        self.rows.insert(pos, entry)
+
+
+def entry(entry_id, day, symptom):
+    return {"id": entry_id, "date": f"2024-01-{day:02d}", "symptom": symptom, "severity": 3,
+            "duration": "", "triggers": "", "notes": ""}
+
+
+def test_add_entry_with_active_filter_under_sqlite(tmp_path):
+    seed = SqliteStorage(str(tmp_path / DB_FILE))
+    seed.save([entry("a", 1, "Headache"), entry("b", 3, "Nausea"), entry("c", 5, "Headache")])
+    seed.close()
+    tracker = Tracker(str(tmp_path))
+    tracker.load()
+
+    active_filter = parse_filter("head", "", "")
+    filtered = tracker.query(*active_filter)
+    app = types.SimpleNamespace(
+        tracker=tracker,
+        store=tracker.store,
+        active_filter=active_filter,
+        filtered=filtered,
+        table_view=Table(filtered),
+        filter_worker=IdleWorker(),
+        status_var=Var(),
+        date_var=Var("2024-01-04"),
+        symptom_var=Var("Headache"),
+        severity_var=Var("4"),
+        duration_var=Var(""),
+        triggers_var=Var(""),
+        notes_text=Notes(""),
+        _transfer_busy=lambda: False,
+        _clear_form=lambda: None,
+    )
+
+    main.SymptomTrackerApp._add_entry(app)
+
+    assert [item["date"] for item in app.filtered] == ["2024-01-01", "2024-01-04", "2024-01-05"]
+    assert app.filtered == tracker.query(*active_filter)
+    tracker.close()
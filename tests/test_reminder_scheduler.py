@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from reminder_scheduler import MAX_SLEEP_SECONDS, ReminderScheduler
+
+NOW = datetime(2024, 5, 6, 9, 5)
+REMINDER = {"id": "r1", "time": "09:00", "message": "Log symptoms"}
+
+
+def test_startup_fires_an_occurrence_missed_within_the_grace():
+    scheduler = ReminderScheduler([REMINDER], now=NOW)
+
+    assert scheduler.due(NOW) == [REMINDER]
+    assert scheduler.last_fired == {"r1": "2024-05-06"}
+    assert scheduler.next_fire_time() == datetime(2024, 5, 7, 9, 0)
+
+
+def test_startup_skips_an_occurrence_already_fired():
+    scheduler = ReminderScheduler([REMINDER], last_fired={"r1": "2024-05-06"}, now=NOW)
+
+    assert scheduler.due(NOW) == []
+    assert scheduler.next_fire_time() == datetime(2024, 5, 7, 9, 0)
+
+
+def test_startup_skips_occurrences_older_than_the_grace():
+    scheduler = ReminderScheduler([REMINDER], now=NOW + timedelta(hours=1))
+
+    assert scheduler.due(NOW + timedelta(hours=1)) == []
+
+
+def test_added_reminder_waits_for_its_next_occurrence():
+    scheduler = ReminderScheduler(now=NOW)
+    scheduler.add(REMINDER, NOW)
+
+    assert scheduler.due(NOW) == []
+    assert scheduler.next_fire_time() == datetime(2024, 5, 7, 9, 0)
+
+    later = {"id": "r2", "time": "09:30", "message": "Water"}
+    scheduler.add(later, NOW)
+    assert scheduler.next_delay(NOW) == MAX_SLEEP_SECONDS
+    assert scheduler.due(datetime(2024, 5, 6, 9, 30)) == [later]
+
+
+def test_removed_and_edited_reminders_do_not_fire():
+    scheduler = ReminderScheduler(now=NOW)
+    scheduler.add({"id": "r1", "time": "10:00"}, NOW)
+    scheduler.add({"id": "r2", "time": "10:00"}, NOW)
+    scheduler.remove("r1")
+    edited = {"id": "r2", "time": "11:00"}
+    scheduler.add(edited, NOW)
+
+    assert scheduler.due(datetime(2024, 5, 6, 10, 0)) == []
+    assert scheduler.due(datetime(2024, 5, 6, 11, 0)) == [edited]
@@ -0,0 +1,77 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from entry_store import EntryStore
+from storage import SqliteStorage
+
+ENTRIES = [
+    {"id": "a", "date": "2024-01-03", "symptom": "Headache", "severity": 4, "duration": "",
+     "triggers": "stress, screens", "notes": "after work"},
+    {"id": "b", "date": "2024-01-01", "symptom": "Nausea", "severity": 2, "duration": "",
+     "triggers": "", "notes": "Headache later"},
+    {"id": "c", "date": "someday", "symptom": "Dizzy", "severity": 1, "duration": "",
+     "triggers": "heat", "notes": ""},
+    {"id": "d", "date": "2024-02-10", "symptom": "Headache", "severity": 6, "duration": "",
+     "triggers": "", "notes": "ÉTÉ heat"},
+    {"id": "e", "date": "2024-01-03", "symptom": "Back pain", "severity": 3, "duration": "",
+     "triggers": "lifting", "notes": "stress"},
+]
+
+
+@pytest.fixture
+def backends(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "symptoms.db"))
+    storage.save(ENTRIES)
+    store = EntryStore(storage.load())
+    yield storage, store
+    storage.close()
+
+
+def iso(value):
+    return value.isoformat() if value else None
+
+
+@pytest.mark.parametrize("text", ["", "he", "headache", "headache stress", "ache later", "e, s", "été", "zzz", "k p"])
+@pytest.mark.parametrize("dates", [(None, None), (date(2024, 1, 2), None), (None, date(2024, 1, 31)),
+                                   (date(2024, 1, 3), date(2024, 1, 3))])
+def test_query_matches_entry_store(backends, text, dates):
+    storage, store = backends
+    from_date, to_date = dates
+
+    found = storage.query(text, iso(from_date), iso(to_date))
+
+    expected = store.query(text, from_date, to_date)
+    assert [entry.id for entry in found] == [entry.id for entry in expected]
+
+
+def test_query_sees_adds_and_deletes(backends):
+    storage, _store = backends
+    storage.append({"id": "f", "date": "2024-03-01", "symptom": "Cough", "severity": 2, "duration": "",
+                    "triggers": "dust", "notes": ""}, [])
+    storage.delete({"a"}, [])
+
+    assert [entry.id for entry in storage.query("headache")] == ["b", "d"]
+    assert [entry.id for entry in storage.query("cough dust")] == ["f"]
+
+
+def test_old_per_field_index_is_replaced(tmp_path):
+    path = str(tmp_path / "symptoms.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE entries (rowid INTEGER PRIMARY KEY, id TEXT, date TEXT, symptom TEXT,
+                              severity TEXT, duration TEXT, triggers TEXT, notes TEXT);
+        CREATE VIRTUAL TABLE entries_fts USING fts5(
+            symptom, triggers, notes, content='entries', content_rowid='rowid', tokenize='trigram'
+        );
+        INSERT INTO entries VALUES (1, 'a', '2024-01-03', 'Headache', '4', '', 'stress', '');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    storage = SqliteStorage(path)
+    assert [entry.id for entry in storage.query("headache stress")] == ["a"]
+    storage.close()
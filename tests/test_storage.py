@@ -0,0 +1,132 @@
+import json
+import os
+
+import pytest
+
+from perf_trace import spans
+from storage import JournalStorage, JsonStorage, SqliteStorage, Storage, _replay
+
+
+def entry(entry_id):
+    return {"id": entry_id, "date": "2024-01-01", "symptom": "Headache", "severity": 3,
+            "duration": "", "triggers": "", "notes": ""}
+
+
+def write_lines(path, lines):
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("".join(lines))
+
+
+def add_line(entry_id):
+    return json.dumps({"op": "add", "entry": entry(entry_id)}) + "\n"
+
+
+def test_replay_skips_torn_line_and_keeps_later_records(tmp_path):
+    journal = str(tmp_path / "data.json.journal")
+    write_lines(journal, [add_line("a"), '{"op": "add", "entry": {"id": "x', "\n", add_line("b"), add_line("c")])
+
+    assert [item["id"] for item in _replay([], journal)] == ["a", "b", "c"]
+
+
+def test_append_after_torn_tail_starts_a_new_line(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_lines(path + ".journal", [add_line("a"), '{"op": "add", "ent'])
+
+    storage = JournalStorage(path)
+    entries = storage.load()
+    assert [item["id"] for item in entries] == ["a"]
+    entries.append(entry("b"))
+    storage.append(entry("b"), entries)
+    storage.close()
+
+    reopened = JournalStorage(path)
+    assert [item["id"] for item in reopened.load()] == ["a", "b"]
+    reopened.close()
+
+
+def test_delete_and_compaction_round_trip(tmp_path):
+    path = str(tmp_path / "data.json")
+    storage = JournalStorage(path, compact_threshold=1)
+    entries = []
+    for entry_id in ("a", "b", "c"):
+        entries.append(entry(entry_id))
+        storage.append(entry(entry_id), entries)
+        storage.writer.flush()
+    entries = [item for item in entries if item["id"] != "b"]
+    storage.delete({"b"}, entries)
+    storage.close()
+
+    reopened = JournalStorage(path)
+    assert [item["id"] for item in reopened.load()] == ["a", "c"]
+    reopened.close()
+    assert not os.path.exists(path + ".compacting")
+
+
+def test_interrupted_compaction_is_merged_once(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_lines(path, [json.dumps([entry("a"), entry("b")])])
+    # The snapshot already holds "b": the compaction finished writing but not cleaning up.
+    write_lines(path + ".compacting", [add_line("b")])
+    write_lines(path + ".journal", [add_line("c")])
+
+    storage = JournalStorage(path)
+    assert [item["id"] for item in storage.load()] == ["a", "b", "c"]
+    storage.close()
+    assert not os.path.exists(path + ".compacting")
+    assert not os.path.exists(path + ".journal")
+
+
+def test_damaged_snapshot_sets_its_journals_aside(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_lines(path, ["[{not json"])
+    write_lines(path + ".journal", [add_line("a")])
+    write_lines(path + ".compacting", [add_line("b")])
+    write_lines(path + ".journal.damaged", ["earlier"])
+
+    storage = JournalStorage(path, compact_threshold=1)
+    with pytest.raises(ValueError, match=r"data\.json\.damaged"):
+        storage.load()
+
+    # A fresh start must neither replay nor compact away the old records.
+    entries = []
+    for entry_id in ("c", "d"):
+        entries.append(entry(entry_id))
+        storage.append(entries[-1], entries)
+        storage.writer.flush()
+    storage.close()
+    assert [item["id"] for item in storage.load()] == ["c", "d"]
+    assert sorted(name for name in os.listdir(tmp_path) if "damaged" in name) == [
+        "data.json.compacting.damaged", "data.json.damaged",
+        "data.json.journal.damaged", "data.json.journal.damaged.1",
+    ]
+    with open(path + ".journal.damaged", encoding="utf-8") as handle:
+        assert handle.read() == "earlier"
+
+
+def test_storage_backends_implement_the_abstract_methods(tmp_path):
+    with pytest.raises(TypeError):
+        Storage(str(tmp_path / "data.json"))
+
+    for backend in (JsonStorage, JournalStorage):
+        storage = backend(str(tmp_path / f"{backend.__name__}.json"))
+        assert not storage.supports_query and not hasattr(storage, "query")
+        storage.close()
+    storage = SqliteStorage(str(tmp_path / "symptoms.db"))
+    assert storage.supports_query and storage.query() == []
+    storage.close()
+
+
+def test_writes_are_timed_where_they_happen(tmp_path, monkeypatch):
+    monkeypatch.setattr(spans, "enabled", True)
+    monkeypatch.setattr(spans, "stats", {})
+    storage = JournalStorage(str(tmp_path / "data.json"), str(tmp_path / "reminders.json"), compact_threshold=1)
+    storage.load()
+    entries = [entry("a")]
+    storage.append(entries[0], entries)
+    storage.writer.flush()
+    entries.append(entry("b"))
+    storage.append(entries[1], entries)
+    storage.save_reminders([{"id": "r", "time": "09:00", "message": "Log"}])
+    storage.close()
+
+    assert {"save.journal", "save.compact", "save.file"} <= set(spans.stats)
@@ -0,0 +1,140 @@
+from table_view import MARGIN, VirtualTable
+
+
+class FakeTree:
+    # Ordered items and a view of `height` rows, enough of ttk.Treeview for VirtualTable.
+    def __init__(self, height=20):
+        self.height = height
+        self.items = []
+        self.selected = set()
+        self.offset = 0
+        self.idle = []
+        self.yscrollcommand = None
+
+    def configure(self, yscrollcommand=None):
+        self.yscrollcommand = yscrollcommand
+
+    def get_children(self):
+        return list(self.items)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.items.insert(len(self.items) if index == "end" else index, iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.items.remove(iid)
+        self.selected.difference_update(iids)
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def selection(self):
+        return tuple(self.selected)
+
+    def selection_set(self, iids):
+        self.selected = set(iids)
+
+    def yview(self, *args):
+        if not args:
+            return self._fractions()
+        _, count, _units = args
+        self.yview_moveto((self.offset + int(count)) / len(self.items))
+
+    def yview_moveto(self, fraction):
+        limit = max(0, len(self.items) - self.height)
+        self.offset = max(0, min(round(fraction * len(self.items)), limit))
+        self.yscrollcommand(*self._fractions())
+
+    def _fractions(self):
+        count = len(self.items) or 1
+        return self.offset / count, min(count, self.offset + self.height) / count
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def run_idle(self):
+        while self.idle:
+            self.idle.pop(0)()
+
+    def first_visible(self):
+        return self.items[self.offset]
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.command = None
+        self.position = None
+
+    def configure(self, command=None):
+        self.command = command
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+def rows(count):
+    return [{"id": f"r{n}", "date": f"row {n}"} for n in range(count)]
+
+
+def make_table(count, window_size=300):
+    tree = FakeTree()
+    scrollbar = FakeScrollbar()
+    table = VirtualTable(tree, scrollbar, ("date",), window_size)
+    table.set_rows(rows(count))
+    return table, tree, scrollbar
+
+
+def window_ids(table):
+    return [entry["id"] for entry in table.rows[table.top:table.top + table.shown]]
+
+
+def test_treeview_holds_one_window_and_scrollbar_spans_all_rows():
+    table, tree, scrollbar = make_table(100_000)
+
+    assert len(tree.items) == 300
+    assert scrollbar.position == (0.0, 20 / 100_000)
+
+    scrollbar.command("moveto", "0.5")
+    assert len(tree.items) == 300
+    assert tree.first_visible() == "r50000"
+    assert scrollbar.position[0] == 0.5
+
+    scrollbar.command("moveto", "1.0")
+    assert tree.items[-1] == "r99999"
+
+
+def test_scrolling_to_the_window_edge_moves_the_window():
+    table, tree, scrollbar = make_table(10_000)
+
+    for _ in range(25):
+        scrollbar.command("scroll", "10", "units")
+        tree.run_idle()
+    assert tree.first_visible() == "r250"
+    assert table.top == 80 and len(tree.items) == 300
+    assert tree.items == window_ids(table)
+    assert tree.offset >= MARGIN
+
+
+def test_selection_survives_a_window_move():
+    table, tree, scrollbar = make_table(10_000)
+    scrollbar.command("moveto", "0.5")
+    tree.selection_set(["r5000", "r5001"])
+
+    scrollbar.command("moveto", "0.501")
+    assert set(tree.selection()) == {"r5000", "r5001"}
+
+
+def test_insert_and_remove_keep_the_window_bounded_and_in_order():
+    table, tree, scrollbar = make_table(1_000)
+    scrollbar.command("moveto", "0.5")
+    top = table.top
+
+    table.insert(0, {"id": "above", "date": ""})
+    assert table.top == top + 1 and "above" not in tree.items
+    table.insert(top + 11, {"id": "inside", "date": ""})
+    assert "inside" in tree.items and len(tree.items) == 300
+
+    table.remove_ids({"above", "inside", "r0", window_ids(table)[5]})
+    assert len(table.rows) == 998
+    assert len(tree.items) == 300
+    assert tree.items == window_ids(table)
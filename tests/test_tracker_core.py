@@ -0,0 +1,30 @@
+import threading
+import time
+
+import tracker_core
+from analytics import SymptomAnalytics
+from tracker_core import Tracker
+
+
+def entry(entry_id, symptom):
+    return {"id": entry_id, "date": "2024-01-01", "symptom": symptom, "severity": 3,
+            "duration": "", "triggers": "", "notes": ""}
+
+
+def test_analytics_built_during_an_import_counts_every_entry(tmp_path, monkeypatch):
+    tracker = Tracker(str(tmp_path))
+    tracker.load()
+    tracker.add_entry(entry("a", "Headache"))
+    importer = threading.Thread(target=tracker.add_entries, args=([entry("b", "Nausea")],))
+
+    def build_while_importing(rows):
+        importer.start()
+        time.sleep(0.05)
+        return SymptomAnalytics(rows)
+
+    monkeypatch.setattr(tracker_core, "SymptomAnalytics", build_while_importing)
+    analytics = tracker.analytics
+    importer.join()
+
+    assert dict(analytics.counts) == {"Headache": 1, "Nausea": 1}
+    tracker.close()
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from write_behind import WriteBehind
+
+
+class FlakyWrite:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("disk full")
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_background_failure_is_reported_then_retried_until_it_succeeds():
+    writer = WriteBehind(delay=0.01)
+    write = FlakyWrite(failures=2)
+    writer.schedule("journal", write)
+
+    wait_for(lambda: writer.error is not None)
+    assert isinstance(writer.error, OSError)
+
+    wait_for(lambda: write.calls == 3)
+    wait_for(lambda: writer.error is None)
+    writer.close()
+    assert write.calls == 3
+
+
+def test_flush_raises_only_if_the_last_attempt_fails():
+    writer = WriteBehind(delay=60)
+    writer.schedule("journal", FlakyWrite(failures=1))
+    with pytest.raises(OSError):
+        writer.flush()
+    assert writer.error is not None
+
+    writer.flush()
+    assert writer.error is None
+    writer.close()
+
+
+def test_newer_write_replaces_a_failed_one():
+    writer = WriteBehind(delay=60)
+    writer.schedule("reminders", FlakyWrite(failures=5))
+    with pytest.raises(OSError):
+        writer.flush()
+    newer = FlakyWrite(failures=0)
+    writer.schedule("reminders", newer)
+
+    writer.close()
+    assert newer.calls == 1
@@ -0,0 +1,312 @@
+import json
+import os
+import threading
+from collections import Counter
+from datetime import date, datetime
+
+from analytics import SymptomAnalytics, severity_value
+from columnar import read_npz, write_npz
+from csv_io import IMPORT_BATCH, read_csv_batches, write_csv_chunks
+from entry_ids import advance_past, assign_unique_ids, new_id
+from entry_record import DATE_FMT, TIME_FMT, Entry, as_entry
+from entry_store import EntryStore
+from reminder_scheduler import ReminderScheduler
+from storage import open_storage
+
+# GUI-free core of the symptom tracker.
+#
+# Everything that does not need a window lives here: loading and saving,
+# entry/reminder validation, filtering, CSV export and reminder evaluation.
+# main.py (Tkinter) and cli.py are both thin clients over Tracker.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = "data.json"
+REMINDERS_FILE = "reminders.json"
+DB_FILE = "symptoms.db"
+
+
+class ValidationError(ValueError):
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+def today_str():
+    return date.today().strftime(DATE_FMT)
+
+
+def parse_date(value):
+    try:
+        value = value.strip()
+        # Canonical YYYY-MM-DD takes the fast path; strptime still handles the rest.
+        if len(value) == 10:
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                pass
+        return datetime.strptime(value, DATE_FMT).date()
+    except Exception:
+        return None
+
+
+def parse_time(value):
+    try:
+        return datetime.strptime(value.strip(), TIME_FMT).time()
+    except Exception:
+        return None
+
+
+def make_entry(date_value, symptom, severity="", duration="", triggers="", notes="", entry_id=None):
+    parsed_date = parse_date(date_value or "")
+    if not parsed_date:
+        raise ValidationError("Invalid Date", "Please enter a valid date in YYYY-MM-DD format.")
+    symptom = (symptom or "").strip()
+    if not symptom:
+        raise ValidationError("Missing Symptom", "Please enter a symptom name.")
+    return Entry(
+        entry_id or new_id(),
+        parsed_date.strftime(DATE_FMT),
+        symptom,
+        (severity or "").strip(),
+        (duration or "").strip(),
+        (triggers or "").strip(),
+        (notes or "").strip(),
+    )
+
+
+def make_reminder(time_value, message):
+    parsed_time = parse_time(time_value or "")
+    if not parsed_time:
+        raise ValidationError("Invalid Time", "Please enter a valid time in HH:MM (24h) format.")
+    message = (message or "").strip()
+    if not message:
+        raise ValidationError("Missing Message", "Please enter a reminder message.")
+    return {
+        "id": new_id(),
+        "time": parsed_time.strftime(TIME_FMT),
+        "message": message,
+    }
+
+
+def parse_filter(query, from_value, to_value):
+    from_value = (from_value or "").strip()
+    to_value = (to_value or "").strip()
+    from_date = parse_date(from_value) if from_value else None
+    to_date = parse_date(to_value) if to_value else None
+    if from_value and not from_date:
+        raise ValidationError("Invalid Filter", "Invalid 'From' date. Use YYYY-MM-DD.")
+    if to_value and not to_date:
+        raise ValidationError("Invalid Filter", "Invalid 'To' date. Use YYYY-MM-DD.")
+    return (query or "").strip().lower(), from_date, to_date
+
+
+def row_to_entry(row):
+    return make_entry(
+        row.get("date"),
+        row.get("symptom"),
+        row.get("severity"),
+        row.get("duration"),
+        row.get("triggers"),
+        row.get("notes"),
+        entry_id=row.get("id"),
+    )
+
+
+def valid_entries(rows, rejected=None):
+    # Rows that fail validation are skipped; their count goes into rejected[0].
+    entries = []
+    for row in rows:
+        try:
+            entries.append(row_to_entry(row))
+        except ValidationError:
+            if rejected is not None:
+                rejected[0] += 1
+    return entries
+
+
+def read_json_rows(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+class Tracker:
+    def __init__(self, base_dir=APP_DIR):
+        self.base_dir = base_dir
+        self.storage = open_storage(
+            os.path.join(base_dir, DATA_FILE),
+            os.path.join(base_dir, REMINDERS_FILE),
+            os.path.join(base_dir, DB_FILE),
+        )
+        self.store = EntryStore()
+        self._analytics = None
+        # Held across a store change and its journal record, so an import
+        # thread and the UI never interleave the two.
+        self._write_lock = threading.Lock()
+        self.reminders = []
+        self.reminder_scheduler = ReminderScheduler()
+
+    def load(self):
+        # Older versions could mint the same id twice within a second; such
+        # duplicates get fresh ids here and the fixed data is written back.
+        entries = [as_entry(entry) for entry in self.storage.load()]
+        advance_past(entry.id for entry in entries)
+        rekeyed = assign_unique_ids(entries)
+        self.store = EntryStore(entries)
+        self._analytics = None
+        if rekeyed:
+            self.save()
+
+    def load_reminders(self):
+        self.reminders = self.storage.load_reminders()
+        advance_past(reminder.get("id") for reminder in self.reminders)
+        rekeyed = assign_unique_ids(
+            self.reminders,
+            get_id=lambda reminder: reminder.get("id"),
+            set_id=lambda reminder, value: reminder.update(id=value),
+        )
+        if rekeyed:
+            self.storage.save_reminders(self.reminders)
+        self.reminder_scheduler = ReminderScheduler(self.reminders, self.storage.load_reminder_state())
+
+    def save(self):
+        self.storage.save(self.store.rows)
+
+    @property
+    def save_error(self):
+        # Set while background writes are failing; they keep being retried.
+        return self.storage.writer.error
+
+    def add_entry(self, entry):
+        entry = as_entry(entry)
+        with self._write_lock:
+            assign_unique_ids([entry], self.store.ids)
+            self.store.add(entry)
+            self.storage.append(entry, self.store)
+            if self._analytics is not None:
+                self._analytics.add(entry)
+
+    def add_entries(self, entries):
+        entries = [as_entry(entry) for entry in entries]
+        with self._write_lock:
+            # Re-imported files carry ids that may already be in the store.
+            assign_unique_ids(entries, self.store.ids)
+            self.store.add_many(entries)
+            self.storage.append_many(entries, self.store)
+            if self._analytics is not None:
+                self._analytics.add_many(entries)
+        return len(entries)
+
+    def import_file(self, path, batch_size=IMPORT_BATCH, progress=None, cancelled=None):
+        # Streams CSV in batches; JSON lists (like data.json) are read whole.
+        # Columnar .npz files were typed on the way out, so they skip validation.
+        # Returns (imported, rejected).
+        rejected = [0]
+        if path.lower().endswith(".npz"):
+            imported = self.add_entries(read_npz(path))
+            if progress:
+                progress(1.0)
+            return imported, 0
+        if path.lower().endswith(".json"):
+            imported = self.add_entries(valid_entries(read_json_rows(path), rejected))
+            if progress:
+                progress(1.0)
+            return imported, rejected[0]
+        imported = 0
+        for rows in read_csv_batches(path, batch_size, progress, cancelled):
+            imported += self.add_entries(valid_entries(rows, rejected))
+        return imported, rejected[0]
+
+    def delete_ids(self, ids):
+        ids = set(ids)
+        with self._write_lock:
+            removed = self.store.remove_ids(ids)
+            self.storage.delete(ids, self.store)
+            if self._analytics is not None:
+                self._analytics.remove_many(removed)
+
+    @property
+    def analytics(self):
+        # Built from the full history on first use, then kept current by
+        # add/delete; under the write lock so an import can't slip entries past it.
+        with self._write_lock:
+            if self._analytics is None:
+                self._analytics = SymptomAnalytics(self.store.rows)
+            return self._analytics
+
+    def query(self, text="", from_date=None, to_date=None, cancelled=None):
+        if self.storage.supports_query:
+            found = self.storage.query(
+                text,
+                from_date.strftime(DATE_FMT) if from_date else None,
+                to_date.strftime(DATE_FMT) if to_date else None,
+            )
+            # The window bisects and diffs results against the store's own
+            # entries, so hand back those rather than the rows just read.
+            rows = (self.store.get(entry.id) for entry in found)
+            return [entry for entry in rows if entry is not None]
+        return self.store.query(text, from_date, to_date, cancelled)
+
+    def export_csv(self, path, entries=None, progress=None, cancelled=None):
+        entries = self.store.rows if entries is None else entries
+        return write_csv_chunks(path, entries, progress=progress, cancelled=cancelled)
+
+    def export_file(self, path, entries=None, progress=None, cancelled=None):
+        # .npz gets the columnar format; anything else is CSV.
+        if path.lower().endswith(".npz"):
+            count = write_npz(path, self.store.rows if entries is None else entries)
+            if progress:
+                progress(1.0)
+            return count
+        return self.export_csv(path, entries, progress, cancelled)
+
+    def add_reminder(self, reminder):
+        self.reminders.append(reminder)
+        self.storage.save_reminders(self.reminders)
+        self.reminder_scheduler.add(reminder)
+
+    def remove_reminder(self, index):
+        removed = self.reminders.pop(index)
+        self.storage.save_reminders(self.reminders)
+        self.reminder_scheduler.remove(removed.get("id"))
+        self.storage.save_reminder_state(self.reminder_scheduler.last_fired)
+        return removed
+
+    def due_reminders(self, now=None):
+        # Fired occurrences are persisted before returning so a restart can't repeat them.
+        due = self.reminder_scheduler.due(now)
+        if due:
+            self.storage.save_reminder_state(self.reminder_scheduler.last_fired)
+        return due
+
+    def stats(self, entries=None):
+        entries = self.store.rows if entries is None else entries
+        counts = Counter(entry.get("symptom", "") for entry in entries)
+        severities = {}
+        for entry in entries:
+            value = severity_value(entry)
+            if value is not None:
+                severities.setdefault(entry.get("symptom", ""), []).append(value)
+        return {
+            "entries": len(entries),
+            "first_date": entries[0].get("date") if entries else None,
+            "last_date": entries[-1].get("date") if entries else None,
+            "symptoms": [
+                {
+                    "symptom": symptom,
+                    "count": count,
+                    "avg_severity": (
+                        round(sum(severities[symptom]) / len(severities[symptom]), 2)
+                        if severities.get(symptom)
+                        else None
+                    ),
+                }
+                for symptom, count in counts.most_common()
+            ],
+        }
+
+    def flush(self):
+        self.storage.flush()
+
+    def close(self):
+        self.storage.close()
@@ -0,0 +1,91 @@
+import atexit
+import threading
+import time
+
+# Coalescing write-behind queue for the storage layer.
+#
+# schedule(key, write) returns immediately. The write runs on a background
+# thread COALESCE_SECONDS later; if the same key is scheduled again before
+# then, only the newest write runs, so a burst of edits costs one disk write.
+# flush() runs everything still pending on the calling thread and waits for a
+# write already in progress. It is called on close and, as a last resort, at
+# interpreter exit. A failed write stays queued (unless a newer one for the
+# same key replaced it) and is retried; until a retry succeeds, `error` holds
+# the failure so the app can tell the user straight away, and flush() raises
+# it if the final attempt fails too.
+
+COALESCE_SECONDS = 0.25
+
+
+class WriteBehind:
+    def __init__(self, delay=COALESCE_SECONDS):
+        self.delay = delay
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._error = None
+        atexit.register(self.flush)
+
+    def schedule(self, key, write):
+        with self._cond:
+            self._pending[key] = write
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Let more edits pile up behind the first one before writing.
+                deadline = time.monotonic() + self.delay
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            error = self._drain()
+            self._error = error
+            if error is not None:
+                # Back off instead of spinning on a write that keeps failing.
+                time.sleep(self.delay)
+
+    def _drain(self):
+        error = None
+        with self._io_lock:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            for key, write in batch.items():
+                try:
+                    write()
+                except Exception as exc:
+                    error = error or exc
+                    with self._cond:
+                        self._pending.setdefault(key, write)
+        return error
+
+    @property
+    def error(self):
+        # The exception from the latest background write, or None once one succeeds.
+        return self._error
+
+    def flush(self):
+        # Everything pending is retried here, so only this attempt's failure counts.
+        error = self._error = self._drain()
+        if error is not None:
+            raise error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify()
+            atexit.unregister(self.flush)